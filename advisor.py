@@ -0,0 +1,671 @@
+import importlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from agent_pool import PoolExhausted
+from budget import PARTIAL_NOTICE, Budget, SharedBudget, is_partial
+from cache import fingerprint
+from metrics import ANALYSES, CACHE_LOOKUPS, record_run, timed, track_run
+from job_index import DEFAULT_INDEX_PATH as JOB_INDEX_PATH, JobIndex, format_postings
+from locations import parse_locations
+from report import parse_report
+from role_matcher import DEFAULT_TAXONOMY_PATH as ROLE_TAXONOMY_PATH, RoleMatcher, format_matches
+from salary_store import SalaryStore, format_salaries
+from similar_cache import SIMILAR_NOTICE, is_similar, open_similar_index, profile_tokens
+from skills import canonicalize_skills, skills_signature
+
+# The model and search stacks take seconds to import, so they load on first agent construction
+# (or earlier via preload_agent_stack) rather than before the first page is rendered
+AGENT_STACK_MODULES = ["phi.agent", "phi.model.google", "tools"]
+
+MODEL_ID = "gemini-2.0-flash-exp"
+# Bump whenever SYSTEM_PROMPT, INSTRUCTIONS or the query template change so cached reports are not reused
+PROMPT_VERSION = "3"
+
+SYSTEM_PROMPT = """
+You are an expert career counselor and job market analyst with deep knowledge of various industries, job roles, and skill requirements.
+Your role is to analyze a person's skills and provide comprehensive job matching analysis based on real-time market data.
+
+You have access to web search tools to gather the latest information about:
+- Current job market trends
+- Specific job role requirements
+- Company hiring practices and salary ranges
+- Skill gap analysis for different roles
+- Industry-specific requirements
+
+Always provide accurate, up-to-date information based on real market data, never use synthetic or placeholder information.
+Focus on actionable insights that can help the person make informed career decisions.
+"""
+
+INSTRUCTIONS = """
+Based on the user's skills, perform the following analysis using web search to gather real-time data:
+
+1. **Eligible Job Roles Analysis:**
+   - Search for current job openings that match the user's skills
+   - Identify specific job titles and roles they qualify for
+   - Provide detailed job descriptions and responsibilities
+   - Include both entry-level and advanced positions based on skill level
+
+2. **Skill Gap Analysis:**
+   - Compare user's skills with requirements for desired/relevant job roles
+   - Identify specific skills that are missing or need improvement
+   - Prioritize skill gaps based on market demand and career impact
+   - Suggest learning resources and certification programs
+
+3. **Company and Opportunity Analysis:**
+   - Search for companies actively hiring for relevant roles
+   - Include company names, sizes, and industries
+   - Provide information about company culture and work environment
+   - Include both established companies and startups
+
+4. **Salary and Package Analysis:**
+   - Research current salary ranges for identified job roles
+   - Include base salary, bonuses, and benefits information
+   - Consider geographic location and experience level
+   - Provide salary progression paths
+
+Return all information in a structured format:
+*Eligible Job Roles:* <detailed list with specific roles, requirements, and market demand>
+*Skill Gap Analysis:* <specific skills missing, priority levels, and learning recommendations>
+*Companies Hiring:* <company names, role details, and application information>
+*Salary Packages:* <current market rates, ranges, and progression paths>
+
+Ensure all information is current, accurate, and based on real market data from your web searches.
+"""
+
+# Section-specific instructions used when the four analyses run as separate agent runs. "inputs"
+# lists the profile fields a section depends on; changing any other field lets it be reused as is.
+SECTIONS = [
+    {
+        "key": "roles",
+        "inputs": ("skills", "experience_level", "career_goals"),
+        "marker": "*Eligible Job Roles:*",
+        "instructions": """
+Based on the user's skills, perform an Eligible Job Roles Analysis using web search to gather real-time data:
+   - Search for current job openings that match the user's skills
+   - Identify specific job titles and roles they qualify for
+   - Provide detailed job descriptions and responsibilities
+   - Include both entry-level and advanced positions based on skill level
+
+Return only this section, starting with the line:
+*Eligible Job Roles:* <detailed list with specific roles, requirements, and market demand>
+""",
+    },
+    {
+        "key": "skill_gaps",
+        "inputs": ("skills", "experience_level", "career_goals"),
+        "marker": "*Skill Gap Analysis:*",
+        "instructions": """
+Based on the user's skills, perform a Skill Gap Analysis using web search to gather real-time data:
+   - Compare user's skills with requirements for desired/relevant job roles
+   - Identify specific skills that are missing or need improvement
+   - Prioritize skill gaps based on market demand and career impact
+   - Suggest learning resources and certification programs
+
+Return only this section, starting with the line:
+*Skill Gap Analysis:* <specific skills missing, priority levels, and learning recommendations>
+""",
+    },
+    {
+        "key": "companies",
+        "inputs": ("skills", "experience_level", "preferred_location", "career_goals"),
+        "marker": "*Companies Hiring:*",
+        "instructions": """
+Based on the user's skills, perform a Company and Opportunity Analysis using web search to gather real-time data:
+   - Search for companies actively hiring for relevant roles
+   - Include company names, sizes, and industries
+   - Provide information about company culture and work environment
+   - Include both established companies and startups
+
+Return only this section, starting with the line:
+*Companies Hiring:* <company names, role details, and application information>
+""",
+    },
+    {
+        "key": "salaries",
+        "inputs": ("skills", "experience_level", "preferred_location", "career_goals"),
+        "marker": "*Salary Packages:*",
+        "instructions": """
+Based on the user's skills, perform a Salary and Package Analysis using web search to gather real-time data:
+   - Research current salary ranges for relevant job roles
+   - Include base salary, bonuses, and benefits information
+   - Consider geographic location and experience level
+   - Provide salary progression paths
+
+Return only this section, starting with the line:
+*Salary Packages:* <current market rates, ranges, and progression paths>
+""",
+    },
+]
+SECTION_FAILED = "⚠️ This section could not be generated"
+
+# Concurrent agent runs when a profile names several locations and its location-dependent sections fan out per city
+LOCATION_WORKERS = int(os.environ.get("LOCATION_WORKERS", 4))
+# Appended to the query of one city's section run; the "In short:" line becomes its cell in the comparison table
+LOCATION_PROMPT = """
+        Cover {city} only; the candidate's other target locations are analyzed separately.
+        End the section with one line starting with "In short:" that sums it up for {city} in under 15 words.
+"""
+_IN_SHORT = re.compile(r"^[ \t*_]*In short:[ \t*_]*(.*?)[ \t*_]*$", re.MULTILINE | re.IGNORECASE)
+
+
+def preload_agent_stack():
+    """Import the model and tool modules ahead of the first create_agent() call."""
+    for name in AGENT_STACK_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            # create_agent() raises the same error where it can be reported to the user
+            return
+
+
+def create_agent(google_api_key, tavily_api_key, search_cache, instructions=INSTRUCTIONS):
+    """Build a career-analysis agent backed by Gemini and cached Tavily search."""
+    from phi.agent import Agent
+    from phi.model.google import Gemini
+
+    from tools import CachedTavilyTools
+
+    return Agent(
+        model=Gemini(id=MODEL_ID, api_key=google_api_key),
+        system_prompt=SYSTEM_PROMPT,
+        instructions=instructions,
+        tools=[CachedTavilyTools(search_cache, api_key=tavily_api_key)],
+        markdown=True,
+        # Runs are independent; never replay earlier users' messages into a new run
+        add_history_to_messages=False,
+    )
+
+
+def build_query(skills, experience_level, preferred_location, career_goals, grounding="", section=None):
+    """Create the user query for the agent, optionally with local reference data.
+
+    With a section (an entry of SECTIONS) the query asks for that section
+    only instead of the comprehensive report.
+    """
+    if section is None:
+        request = "Please provide a comprehensive job market analysis including eligible roles, skill gaps, hiring companies, and salary information."
+    else:
+        request = f"Please provide only the {section['marker'].strip('*:')} part of the analysis; the other parts are written separately."
+    query = f"""
+        Analyze job opportunities for a candidate with the following profile:
+        
+        Skills: {skills}
+        Experience Level: {experience_level}
+        Preferred Location: {preferred_location}
+        Career Goals: {career_goals}
+        
+        {request}
+        Use current market data from job portals, company websites, and industry reports.
+        """
+    if grounding:
+        query += f"""
+        Local reference data (already retrieved; use it first and only search the web for what it does not cover):
+{grounding}
+        """
+    return query
+
+
+def open_local_data():
+    """The local indexes the web app grounds on, opened the same way for off-app processes.
+
+    Returns keyword arguments for analyze_profile(); sources that have not
+    been built are None, exactly as in the app.
+    """
+    return {
+        "job_index": JobIndex(JOB_INDEX_PATH) if os.path.exists(JOB_INDEX_PATH) else None,
+        "role_matcher": RoleMatcher.load(ROLE_TAXONOMY_PATH) if os.path.exists(ROLE_TAXONOMY_PATH) else None,
+        "salary_store": SalaryStore.open(),
+        "similar_index": open_similar_index(),
+    }
+
+
+def local_grounding(
+    skills,
+    preferred_location,
+    job_index=None,
+    role_matcher=None,
+    role_matches=None,
+    k=8,
+    salary_store=None,
+    experience_level="",
+):
+    """Reference data from local indexes, formatted for the prompt.
+
+    role_matches may be passed in when they were already computed for a whole
+    batch of candidates with RoleMatcher.rank_batch(). With a salary_store,
+    the matched roles get local salary ranges for the candidate's location
+    and experience band.
+    """
+    blocks = []
+    skill_list = canonicalize_skills(skills)
+    if role_matches is None and role_matcher is not None:
+        with timed("role_match"):
+            role_matches = role_matcher.rank(skill_list)
+    if role_matches:
+        blocks.append(
+            "Roles ranked by weighted skill coverage (explain and refine these rather than searching for roles from scratch):\n"
+            + format_matches(role_matches)
+        )
+    if job_index is not None:
+        with timed("job_index_search"):
+            postings = job_index.search(skill_list, preferred_location, k=k)
+        if postings:
+            blocks.append("Job postings matching the candidate's skills:\n" + format_postings(postings))
+    if salary_store is not None and role_matches:
+        with timed("salary_lookup"):
+            salaries = [salary_store.lookup(match["title"], preferred_location, experience_level) for match in role_matches]
+        salaries = [row for row in salaries if row is not None]
+        if salaries:
+            blocks.append(
+                "Salary ranges from local data (use these; only search the web for roles not listed):\n"
+                + format_salaries(salaries)
+            )
+    return "\n\n".join(blocks)
+
+
+def run_agent(agent, query, on_progress=None, budget=None, **labels):
+    """Run one agent call, streaming into on_progress when given, and record its metrics.
+
+    With a budget, tool calls on this thread are checked against it and the
+    response is consumed as a stream so it can be cut off at the deadline or
+    when the budget is cancelled.
+    """
+    if budget is not None and budget.cancelled:
+        return ""
+    streamed = on_progress is not None or budget is not None
+    budget = budget or Budget()
+    with budget.active(), track_run() as stats, timed("agent_run", **labels):
+        if not streamed:
+            content = agent.run(query).content or ""
+        else:
+            content = ""
+            stream = agent.run(query, stream=True)
+            for chunk in stream:
+                if chunk.content:
+                    content += chunk.content
+                    if on_progress is not None:
+                        on_progress(content)
+                if budget.cut_off():
+                    stream.close()
+                    break
+    record_run(agent, stats["tool_calls"], **labels)
+    return content
+
+
+def _run_section(pool, section, query, budget=None):
+    if budget is not None and budget.cancelled:
+        # Do not wait for an agent just to discard its output
+        return section["marker"]
+    try:
+        with pool.checkout(section["instructions"], timeout=budget and budget.remaining()) as agent:
+            content = run_agent(agent, query, budget=budget, section=section["key"]).strip()
+    except PoolExhausted:
+        if budget is None or budget.remaining() is None or budget.remaining() > 0:
+            raise
+        # The deadline passed while waiting for a free agent: the section is left out of a partial report
+        budget.exhausted = True
+        return section["marker"]
+    report = parse_report(content, memoize=False)
+    # Keep only this run's own section; anything else the model added would duplicate the other runs
+    body = getattr(report, section["key"]) or ("" if report.sections() else report.preamble)
+    return f"{section['marker']}\n{body}"
+
+
+def run_sections_parallel(pool, profile, max_workers=4, on_section=None, budget=None, sections=SECTIONS, reused=None):
+    """Run the report sections as concurrent agent runs and merge them in report order.
+
+    profile holds the build_query() arguments; each section gets a query
+    scoped to it and checks out its own agent from pool (an AgentPool). A failed
+    section is replaced by a short notice so the remaining sections are still
+    returned. All sections share one budget, if given. With sections, only
+    those are run and merged with the already finished texts in reused
+    ({key: section text}).
+    """
+    results = dict(reused or {})
+    if results and on_section is not None:
+        on_section(merge_sections(results))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="section") as executor:
+        futures = {
+            executor.submit(_run_section, pool, section, build_query(**profile, section=section), budget): section
+            for section in sections
+        }
+        for future in as_completed(futures):
+            section = futures[future]
+            try:
+                results[section["key"]] = future.result()
+            except Exception as e:
+                results[section["key"]] = f"{section['marker']}\n{SECTION_FAILED} ({e})."
+            if on_section is not None:
+                on_section(merge_sections(results))
+    return merge_sections(results)
+
+
+def _run_location_section(pool, result_cache, section, profile, city, grounding_sources, budget=None):
+    """One location-dependent section for a single city, cached on its own so overlapping profiles reuse it."""
+    skills, experience_level, career_goals = profile["skills"], profile["experience_level"], profile["career_goals"]
+    grounding = local_grounding(skills, city, experience_level=experience_level, **grounding_sources)
+    cache_key = fingerprint(
+        skills_signature(skills) or skills,
+        experience_level,
+        city.lower(),
+        career_goals,
+        MODEL_ID,
+        PROMPT_VERSION,
+        section["key"],
+        grounding,
+    )
+    cached = result_cache.get(cache_key)
+    CACHE_LOOKUPS.inc(cache="location", outcome="hit" if cached is not None else "miss")
+    if cached is not None:
+        return cached
+    query = build_query(skills, experience_level, city, career_goals, grounding, section) + LOCATION_PROMPT.format(city=city)
+    content = _run_section(pool, section, query, budget)
+    if budget is None or not (budget.exhausted or budget.cancelled):
+        result_cache.set(cache_key, content)
+    return content
+
+
+def _in_short(body):
+    """Split a city section body into its "In short:" summary and the rest."""
+    matches = list(_IN_SHORT.finditer(body))
+    if not matches:
+        return "", body
+    last = matches[-1]
+    return last.group(1), (body[: last.start()] + body[last.end():]).strip()
+
+
+def merge_locations(locations, city_texts):
+    """Section texts for location-dependent sections, one sub-heading per city.
+
+    city_texts maps section key to {city: section text}. The first merged
+    section opens with a table comparing the cities on each section's
+    "In short:" summary; cities still running show as "…".
+    """
+    sections = [section for section in SECTIONS if section["key"] in city_texts]
+    rows = {city: [] for city in locations}
+    bodies = {}
+    for section in sections:
+        bodies[section["key"]] = []
+        for city in locations:
+            text = city_texts[section["key"]].get(city)
+            if text is None:
+                rows[city].append("…")
+                continue
+            summary, body = _in_short(getattr(parse_report(text), section["key"]))
+            rows[city].append(summary.replace("|", "\\|") or "—")
+            bodies[section["key"]].append(f"**📍 {city}**\n\n{body}")
+    titles = [section["marker"].strip("*:") for section in sections]
+    table = "\n".join(
+        [f"| Location | {' | '.join(titles)} |", "|" + " --- |" * (len(titles) + 1)]
+        + [f"| {city} | {' | '.join(cells)} |" for city, cells in rows.items()]
+    )
+    return {
+        section["key"]: "\n\n".join([section["marker"]] + ([table] if index == 0 else []) + bodies[section["key"]])
+        for index, section in enumerate(sections)
+    }
+
+
+def run_locations_parallel(
+    pool,
+    result_cache,
+    profile,
+    locations,
+    grounding_sources=None,
+    max_workers=LOCATION_WORKERS,
+    on_section=None,
+    budget=None,
+    reused=None,
+):
+    """Run the report for several target locations, fanning location-dependent sections out per city.
+
+    locations are the places parse_locations() found in one preferred
+    location, e.g. "New York, Remote, London". profile holds the build_query()
+    arguments. Sections whose "inputs" include preferred_location run once per
+    city, grounded on that city's local data (grounding_sources are the
+    local_grounding() keyword arguments) and cached per city, then merged with
+    a comparison table; the others run once. All runs share one bounded pool
+    and one budget, and sections in reused ({key: section text}) are not run.
+    """
+    results = dict(reused or {})
+    city_texts = {}
+    if results and on_section is not None:
+        on_section(merge_sections(results))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="location") as executor:
+        futures = {}
+        for section in SECTIONS:
+            if section["key"] in results:
+                continue
+            if "preferred_location" not in section["inputs"]:
+                query = build_query(**profile, section=section)
+                futures[executor.submit(_run_section, pool, section, query, budget)] = (section, None)
+                continue
+            city_texts[section["key"]] = {}
+            for city in locations:
+                future = executor.submit(
+                    _run_location_section, pool, result_cache, section, profile, city, grounding_sources or {}, budget
+                )
+                futures[future] = (section, city)
+        for future in as_completed(futures):
+            section, city = futures[future]
+            try:
+                content = future.result()
+            except Exception as e:
+                content = f"{section['marker']}\n{SECTION_FAILED} ({e})."
+            if city is None:
+                results[section["key"]] = content
+            else:
+                city_texts[section["key"]][city] = content
+                results.update(merge_locations(locations, city_texts))
+            if on_section is not None:
+                on_section(merge_sections(results))
+    return merge_sections(results)
+
+
+def merge_sections(results):
+    """Join section texts in the canonical report order."""
+    return "\n\n".join(results[section["key"]] for section in SECTIONS if section["key"] in results)
+
+
+def _normalized_inputs(skills, experience_level, preferred_location, career_goals):
+    inputs = {"experience_level": experience_level, "preferred_location": preferred_location, "career_goals": career_goals}
+    normalized = {field: " ".join(str(value or "").lower().split()) for field, value in inputs.items()}
+    normalized["skills"] = skills_signature(skills) or " ".join(str(skills or "").lower().split())
+    return normalized
+
+
+def reusable_sections(previous, skills, experience_level, preferred_location, career_goals):
+    """Sections of a previous report that do not depend on any changed input, as {key: section text}.
+
+    previous is {"inputs": {field: value}, "report": text} for the profile's
+    last analysis; only sections whose SECTIONS "inputs" changed need to run
+    again, e.g. a new location re-runs companies and salaries. Partial,
+    reused-similar and failed sections are never carried over.
+    """
+    report = previous.get("report") if previous else None
+    if not report or not previous.get("inputs") or is_partial(report) or is_similar(report):
+        return {}
+    before = _normalized_inputs(**previous["inputs"])
+    after = _normalized_inputs(skills, experience_level, preferred_location, career_goals)
+    changed = {field for field, value in after.items() if before[field] != value}
+    parsed = parse_report(report)
+    reused = {}
+    for section in SECTIONS:
+        body = getattr(parsed, section["key"])
+        if body and SECTION_FAILED not in body and not changed.intersection(section["inputs"]):
+            reused[section["key"]] = f"{section['marker']}\n{body}"
+    return reused
+
+
+def profile_cache_key(skills, experience_level, preferred_location, career_goals, mode="single", grounding=""):
+    """Result-cache key for an already canonicalized profile and the local data it was grounded on."""
+    return fingerprint(
+        skills, experience_level, preferred_location, career_goals, MODEL_ID, PROMPT_VERSION, mode, grounding
+    )
+
+
+def prepare_profile(
+    skills,
+    experience_level,
+    preferred_location,
+    career_goals,
+    mode="single",
+    job_index=None,
+    role_matcher=None,
+    role_matches=None,
+    salary_store=None,
+):
+    """Canonical skills signature, local grounding and result-cache key for one profile."""
+    # Equivalent skill lists ("ML, python" vs "Python, Machine Learning") share one cache entry;
+    # the prompt still gets the user's own wording, which the signature may have normalized away
+    signature = skills_signature(skills) or skills
+    grounding = local_grounding(
+        skills,
+        preferred_location,
+        job_index,
+        role_matcher,
+        role_matches,
+        salary_store=salary_store,
+        experience_level=experience_level,
+    )
+    cache_key = profile_cache_key(signature, experience_level, preferred_location, career_goals, mode, grounding)
+    return signature, grounding, cache_key
+
+
+def analyze_profile(
+    pool,
+    result_cache,
+    skills,
+    experience_level,
+    preferred_location,
+    career_goals,
+    mode="single",
+    stream=False,
+    on_progress=None,
+    single_flight=None,
+    deadline=None,
+    max_tool_calls=None,
+    job_index=None,
+    role_matcher=None,
+    role_matches=None,
+    salary_store=None,
+    similar_index=None,
+    refresh=False,
+    budget=None,
+    previous=None,
+):
+    """Run (or fetch from cache) the career analysis for one profile; shared by the web app and batch mode."""
+    reused = reusable_sections(previous, skills, experience_level, preferred_location, career_goals)
+    if len(reused) == len(SECTIONS):
+        # Nothing relevant changed, but the report was not cached: regenerate it in full
+        reused = {}
+    locations = parse_locations(preferred_location)
+    if len(locations) > 1 and role_matches is None and role_matcher is not None:
+        # Ranked once and shared by the profile's grounding and every city's
+        with timed("role_match"):
+            role_matches = role_matcher.rank(canonicalize_skills(skills))
+    signature, grounding, cache_key = prepare_profile(
+        skills,
+        experience_level,
+        preferred_location,
+        career_goals,
+        mode,
+        job_index=job_index,
+        role_matcher=role_matcher,
+        role_matches=role_matches,
+        salary_store=salary_store,
+    )
+    # refresh skips both cache lookups and replaces the cached report; the warm-up renews entries with it
+    if not refresh:
+        cached = result_cache.get(cache_key)
+        CACHE_LOOKUPS.inc(cache="result", outcome="hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+
+    # On an exact miss, a near-identical profile's cached report is served behind SIMILAR_NOTICE
+    if similar_index is not None:
+        tokens = profile_tokens(signature, career_goals)
+        # Only profiles with the same experience, location and mode are interchangeable
+        scope = fingerprint(experience_level, preferred_location, MODEL_ID, PROMPT_VERSION, mode)
+        if not refresh:
+            with timed("similar_lookup"):
+                for key, _similarity in similar_index.lookup(tokens, scope):
+                    similar = result_cache.get(key)
+                    if similar is not None:
+                        CACHE_LOOKUPS.inc(cache="similar", outcome="hit")
+                        return f"{SIMILAR_NOTICE}\n\n{similar}"
+            CACHE_LOOKUPS.inc(cache="similar", outcome="miss")
+
+    profile = {
+        "skills": skills,
+        "experience_level": experience_level,
+        "preferred_location": preferred_location,
+        "career_goals": career_goals,
+        "grounding": grounding,
+    }
+
+    # Metrics label; the cache key keeps the requested mode since a merged report serves it equally
+    run_mode = "locations" if len(locations) > 1 else "incremental" if reused else mode
+
+    # A run cut short by the deadline, the tool-call cap or a cancel() on the caller's budget
+    # comes back behind PARTIAL_NOTICE and is not cached
+    if budget is None:
+        run_budget = Budget(deadline, max_tool_calls)
+    elif single_flight is None:
+        run_budget = budget
+    else:
+        # Callers coalesced onto this run join it, and it is only cancelled once all of them have cancelled
+        run_budget = SharedBudget(budget.deadline, budget.max_tool_calls, budget.grace)
+        run_budget.started = budget.started
+        run_budget.join(budget)
+
+    def join(leader_budget):
+        # A caller without a budget cannot cancel, so it keeps a shared run going until it finishes
+        return leader_budget is None or leader_budget.join(budget or Budget())
+
+    def analyze():
+        with timed("analysis", mode=run_mode):
+            if len(locations) > 1:
+                result = run_locations_parallel(
+                    pool,
+                    result_cache,
+                    profile,
+                    locations,
+                    {"job_index": job_index, "role_matches": role_matches, "salary_store": salary_store},
+                    on_section=on_progress,
+                    budget=run_budget,
+                    reused=reused,
+                )
+            elif reused:
+                stale = [section for section in SECTIONS if section["key"] not in reused]
+                result = run_sections_parallel(
+                    pool, profile, on_section=on_progress, budget=run_budget, sections=stale, reused=reused
+                )
+            elif mode == "parallel":
+                result = run_sections_parallel(pool, profile, on_section=on_progress, budget=run_budget)
+            else:
+                # An agent that only frees up after the deadline could not finish the report anyway
+                with pool.checkout(timeout=run_budget.remaining()) as agent:
+                    result = run_agent(agent, build_query(**profile), on_progress if stream else None, budget=run_budget, section="all")
+        result = result.strip()
+        if run_budget.cancelled:
+            ANALYSES.inc(mode=run_mode, status="cancelled")
+            result = f"{PARTIAL_NOTICE}\n\n{result}" if result else ""
+        elif not result:
+            ANALYSES.inc(mode=run_mode, status="empty")
+        elif run_budget.exhausted:
+            ANALYSES.inc(mode=run_mode, status="partial")
+            result = f"{PARTIAL_NOTICE}\n\n{result}"
+        else:
+            ANALYSES.inc(mode=run_mode, status="ok")
+            result_cache.set(cache_key, result)
+            if similar_index is not None:
+                similar_index.add(cache_key, tokens, scope)
+        return result
+
+    if single_flight is None:
+        return analyze()
+    # Callers submitting the same profile at the same time share a single agent run
+    leader_state = run_budget if isinstance(run_budget, SharedBudget) else None
+    return single_flight.do(cache_key, analyze, state=leader_state, join=join)
@@ -0,0 +1,80 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class PoolExhausted(TimeoutError):
+    """Raised when no agent becomes free within the checkout timeout."""
+
+
+class AgentPool:
+    """Bounded pool of isolated agents checked out for one run at a time.
+
+    Agents are created lazily by factory() up to size. A checkout blocks
+    while every agent is busy, so concurrent sessions queue instead of
+    sharing one agent's run state. Each agent's memory is cleared when it
+    is returned, which keeps per-agent history from growing across users.
+    """
+
+    def __init__(self, factory, size=8, checkout_timeout=300):
+        self.factory = factory
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+
+    def _acquire(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PoolExhausted(f"No agent available after {timeout:.1f}s ({self.size} in use)")
+
+    @staticmethod
+    def _reset(agent):
+        memory = getattr(agent, "memory", None)
+        if memory is not None and hasattr(memory, "clear"):
+            memory.clear()
+
+    @contextmanager
+    def checkout(self, instructions=None, timeout=None):
+        """Lend an agent for one run, optionally with run-specific instructions.
+
+        timeout shortens the wait for a free agent below checkout_timeout,
+        e.g. to what is left of the caller's deadline.
+        """
+        wait = self.checkout_timeout if timeout is None else min(timeout, self.checkout_timeout)
+        agent = self._acquire(wait)
+        default_instructions = agent.instructions
+        if instructions is not None:
+            agent.instructions = instructions
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield agent
+        finally:
+            agent.instructions = default_instructions
+            self._reset(agent)
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(agent)
+
+    def stats(self):
+        with self._lock:
+            return {"size": self.size, "created": self._created, "in_use": self._in_use}
@@ -1,12 +1,23 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import os
-import pandas as pd
-from phi.agent import Agent
-from phi.model.google import Gemini
-from phi.tools.tavily import TavilyTools
-from datetime import datetime
-import re
-import time
+import threading
+from assets import theme_injection, theme_tags
+from cache import open_result_cache, open_search_cache
+from singleflight import SingleFlight
+from advisor import analyze_profile, create_agent, preload_agent_stack
+from agent_pool import AgentPool
+from budget import is_partial
+from job_index import DEFAULT_INDEX_PATH as JOB_INDEX_PATH, JobIndex
+from jobs import JobManager
+from job_queue import JobQueue
+from metrics import log_event, start_metrics_server, timed
+from pdf_export import PdfExporter
+from role_matcher import DEFAULT_TAXONOMY_PATH as ROLE_TAXONOMY_PATH, RoleMatcher
+from salary_store import EXPERIENCE_LEVELS, SalaryStore
+from similar_cache import is_similar, open_similar_index
+from skills import skills_signature
+from report import SECTION_KEYS, parse_report, render_report_html, render_section_html
 
 # Set page configuration with custom theme
 st.set_page_config(
@@ -16,950 +27,11 @@ st.set_page_config(
     page_icon="🚀"
 )
 
-# Enhanced CSS with cream theme and advanced animations
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&family=Playfair+Display:wght@400;500;600;700&display=swap');
-    
-    /* Cream professional color palette */
-    :root {
-        --primary-cream: #FFF8E7;
-        --secondary-cream: #F5F0E1;
-        --warm-cream: #F0E8D6;
-        --rich-cream: #E8DCC0;
-        --accent-brown: #8B7355;
-        --dark-brown: #6B5B47;
-        --text-dark: #2C2416;
-        --text-medium: #4A3D2A;
-        --text-light: #FFFFFF;
-        --glass-bg: rgba(255, 248, 231, 0.85);
-        --glass-border: rgba(245, 240, 225, 0.9);
-        --shadow-soft: 0 4px 16px -4px rgba(43, 36, 22, 0.08);
-        --shadow-medium: 0 8px 32px -8px rgba(43, 36, 22, 0.12);
-        --shadow-heavy: 0 16px 48px -12px rgba(43, 36, 22, 0.18);
-        --gradient-warm: linear-gradient(135deg, #FFF8E7 0%, #F5F0E1 50%, #F0E8D6 100%);
-        --gradient-rich: linear-gradient(135deg, #E8DCC0 0%, #8B7355 100%);
-    }
-    
-    /* Global font styling */
-    * {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif !important;
-    }
-    
-    .main-header {
-        font-family: 'Playfair Display', serif !important;
-    }
-    
-    /* Animated background with cream gradients */
-    .stApp {
-        background: linear-gradient(-45deg, #FFF8E7, #F5F0E1, #F0E8D6, #E8DCC0, #D4C4A8);
-        background-size: 400% 400%;
-        animation: creamGradientBG 20s ease infinite;
-        min-height: 100vh;
-        position: relative;
-        overflow-x: hidden;
-    }
-    
-    @keyframes creamGradientBG {
-        0% { background-position: 0% 50%; }
-        25% { background-position: 100% 0%; }
-        50% { background-position: 100% 100%; }
-        75% { background-position: 0% 100%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    /* Enhanced floating particles */
-    .particles {
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        z-index: -1;
-        overflow: hidden;
-        pointer-events: none;
-    }
-    
-    .particle {
-        position: absolute;
-        background: rgba(139, 115, 85, 0.15);
-        border-radius: 50%;
-        animation: floatParticle linear infinite;
-        filter: blur(1px);
-    }
-    
-    .particle:nth-child(odd) {
-        background: rgba(232, 220, 192, 0.25);
-        animation: floatParticleReverse linear infinite;
-    }
-    
-    @keyframes floatParticle {
-        0% { 
-            transform: translateY(100vh) translateX(-50px) scale(0);
-            opacity: 0;
-        }
-        10% { 
-            opacity: 1;
-            transform: translateY(90vh) translateX(-40px) scale(1);
-        }
-        90% { 
-            opacity: 0.8;
-            transform: translateY(10vh) translateX(40px) scale(0.8);
-        }
-        100% { 
-            transform: translateY(-10vh) translateX(50px) scale(0);
-            opacity: 0;
-        }
-    }
-    
-    @keyframes floatParticleReverse {
-        0% { 
-            transform: translateY(-10vh) translateX(50px) scale(0);
-            opacity: 0;
-        }
-        10% { 
-            opacity: 1;
-            transform: translateY(0vh) translateX(40px) scale(1);
-        }
-        90% { 
-            opacity: 0.8;
-            transform: translateY(90vh) translateX(-40px) scale(0.8);
-        }
-        100% { 
-            transform: translateY(100vh) translateX(-50px) scale(0);
-            opacity: 0;
-        }
-    }
-    
-    /* Container with enhanced glass morphism */
-    .main .block-container {
-        background: var(--glass-bg) !important;
-        backdrop-filter: blur(20px) saturate(180%) !important;
-        -webkit-backdrop-filter: blur(20px) saturate(180%) !important;
-        border-radius: 20px !important;
-        border: 1px solid var(--glass-border) !important;
-        box-shadow: var(--shadow-medium) !important;
-        padding: 3rem !important;
-        margin-top: 1rem !important;
-        animation: containerFadeIn 1.2s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .main .block-container::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 2px;
-        background: var(--gradient-rich);
-        animation: shimmer 3s ease-in-out infinite;
-    }
-    
-    @keyframes containerFadeIn {
-        from { 
-            opacity: 0; 
-            transform: translateY(40px) scale(0.95);
-            filter: blur(10px);
-        }
-        to { 
-            opacity: 1; 
-            transform: translateY(0) scale(1);
-            filter: blur(0px);
-        }
-    }
-    
-    @keyframes shimmer {
-        0%, 100% { opacity: 0.5; }
-        50% { opacity: 1; }
-    }
-    
-    /* Header with typewriter effect */
-    .main-header {
-        font-size: 3.5rem !important;
-        font-weight: 700 !important;
-        color: var(--accent-brown) !important;
-        text-align: center !important;
-        margin-bottom: 1rem !important;
-        letter-spacing: -1px;
-        animation: typewriter 2s steps(20, end), blink 0.8s step-end infinite alternate;
-        position: relative;
-        overflow: hidden;
-        white-space: nowrap;
-        border-right: 3px solid var(--accent-brown);
-    }
-    
-    @keyframes typewriter {
-        from { width: 0; }
-        to { width: 100%; }
-    }
-    
-    @keyframes blink {
-        50% { border-color: transparent; }
-    }
-    
-    .subtitle {
-        text-align: center;
-        font-size: 1.3rem;
-        font-weight: 400;
-        color: var(--text-medium);
-        margin-bottom: 2.5rem;
-        opacity: 0;
-        animation: subtitleFadeIn 1s ease-out 1s forwards;
-        position: relative;
-    }
-    
-    .subtitle::after {
-        content: '';
-        position: absolute;
-        bottom: -10px;
-        left: 50%;
-        transform: translateX(-50%);
-        width: 60px;
-        height: 2px;
-        background: var(--gradient-rich);
-        animation: lineGrow 1s ease-out 1.5s forwards;
-        transform-origin: center;
-        scale: 0;
-    }
-    
-    @keyframes subtitleFadeIn {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    @keyframes lineGrow {
-        from { scale: 0; }
-        to { scale: 1; }
-    }
-    
-    /* Enhanced card styling with hover animations */
-    .glass-card {
-        background: var(--text-light) !important;
-        border-radius: 16px !important;
-        border: 1px solid var(--rich-cream) !important;
-        padding: 2.5rem !important;
-        margin-bottom: 2rem !important;
-        box-shadow: var(--shadow-soft) !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .glass-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(139, 115, 85, 0.1), transparent);
-        transition: left 0.6s ease;
-    }
-    
-    .glass-card:hover {
-        transform: translateY(-8px) scale(1.02) !important;
-        box-shadow: var(--shadow-heavy) !important;
-        border-color: var(--accent-brown) !important;
-        background: var(--primary-cream) !important;
-    }
-    
-    .glass-card:hover::before {
-        left: 100%;
-    }
-    
-    /* Input section with staggered animations */
-    .input-section {
-        background: var(--text-light) !important;
-        border-radius: 20px !important;
-        border: 1px solid var(--rich-cream) !important;
-        padding: 3rem !important;
-        margin-bottom: 2.5rem !important;
-        box-shadow: var(--shadow-soft) !important;
-        animation: slideInLeft 0.8s cubic-bezier(0.4, 0, 0.2, 1) 0.5s both;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .input-section::after {
-        content: '';
-        position: absolute;
-        top: 0;
-        right: 0;
-        width: 4px;
-        height: 100%;
-        background: var(--gradient-rich);
-        animation: heightGrow 1s ease-out 1s forwards;
-        transform-origin: top;
-        scale: 1 0;
-    }
-    
-    @keyframes slideInLeft {
-        from { 
-            opacity: 0; 
-            transform: translateX(-50px);
-        }
-        to { 
-            opacity: 1; 
-            transform: translateX(0);
-        }
-    }
-    
-    @keyframes heightGrow {
-        from { scale: 1 0; }
-        to { scale: 1 1; }
-    }
-    
-    /* Animated taglines */
-    .tagline {
-        text-align: center !important;
-        font-size: 1.3rem !important;
-        font-weight: 600 !important;
-        color: var(--accent-brown) !important;
-        margin: 2rem auto !important;
-        padding: 1rem 2rem !important;
-        border-radius: 50px !important;
-        background: var(--text-light) !important;
-        border: 2px solid var(--rich-cream) !important;
-        max-width: 600px !important;
-        animation: taglineBounce 0.6s cubic-bezier(0.68, -0.55, 0.265, 1.55) 0.8s both;
-        position: relative;
-        box-shadow: var(--shadow-soft);
-    }
-    
-    .tagline::before {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: -8px;
-        transform: translateY(-50%);
-        width: 16px;
-        height: 16px;
-        background: var(--accent-brown);
-        border-radius: 50%;
-        animation: pulse 2s ease-in-out infinite;
-    }
-    
-    @keyframes taglineBounce {
-        from { 
-            opacity: 0; 
-            transform: scale(0.3) rotate(-10deg);
-        }
-        to { 
-            opacity: 1; 
-            transform: scale(1) rotate(0deg);
-        }
-    }
-    
-    @keyframes pulse {
-        0%, 100% { transform: translateY(-50%) scale(1); opacity: 1; }
-        50% { transform: translateY(-50%) scale(1.2); opacity: 0.7; }
-    }
-    
-    .dark-tagline {
-        text-align: center !important;
-        font-size: 1.3rem !important;
-        font-weight: 600 !important;
-        color: var(--text-light) !important;
-        margin: 2rem auto !important;
-        padding: 1rem 2rem !important;
-        border-radius: 50px !important;
-        background: var(--gradient-rich) !important;
-        max-width: 600px !important;
-        animation: slideInRight 0.8s cubic-bezier(0.4, 0, 0.2, 1) 0.3s both;
-        box-shadow: var(--shadow-medium);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .dark-tagline::after {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        transform: translate(-50%, -50%);
-        width: 0;
-        height: 0;
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 50%;
-        animation: ripple 3s ease-out infinite;
-    }
-    
-    @keyframes slideInRight {
-        from { 
-            opacity: 0; 
-            transform: translateX(50px);
-        }
-        to { 
-            opacity: 1; 
-            transform: translateX(0);
-        }
-    }
-    
-    @keyframes ripple {
-        0% {
-            width: 0;
-            height: 0;
-            opacity: 0.8;
-        }
-        100% {
-            width: 300px;
-            height: 300px;
-            opacity: 0;
-        }
-    }
-    
-    /* Enhanced button with multiple animations */
-    .stButton > button {
-        background: var(--gradient-rich) !important;
-        color: var(--text-light) !important;
-        font-weight: 600 !important;
-        font-size: 1.1rem !important;
-        border-radius: 50px !important;
-        padding: 1rem 2.5rem !important;
-        border: none !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative;
-        overflow: hidden;
-        box-shadow: var(--shadow-soft);
-    }
-    
-    .stButton > button::before {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        transform: translate(-50%, -50%);
-        width: 0;
-        height: 0;
-        background: rgba(255, 255, 255, 0.2);
-        border-radius: 50%;
-        transition: all 0.6s ease;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-3px) scale(1.05) !important;
-        box-shadow: var(--shadow-heavy) !important;
-        background: var(--dark-brown) !important;
-    }
-    
-    .stButton > button:hover::before {
-        width: 300px;
-        height: 300px;
-    }
-    
-    .stButton > button:active {
-        transform: translateY(-1px) scale(1.02) !important;
-    }
-    
-    /* Feature boxes with staggered entrance */
-    .feature-box {
-        background: var(--text-light) !important;
-        border-radius: 20px !important;
-        border: 1px solid var(--rich-cream) !important;
-        padding: 2rem !important;
-        text-align: center !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        height: 100% !important;
-        animation: featureSlideUp 0.6s cubic-bezier(0.4, 0, 0.2, 1) both;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .feature-box:nth-child(1) { animation-delay: 0.1s; }
-    .feature-box:nth-child(2) { animation-delay: 0.2s; }
-    .feature-box:nth-child(3) { animation-delay: 0.3s; }
-    .feature-box:nth-child(4) { animation-delay: 0.4s; }
-    
-    .feature-box::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 4px;
-        background: var(--gradient-rich);
-        transform: scaleX(0);
-        transition: transform 0.3s ease;
-    }
-    
-    .feature-box:hover {
-        transform: translateY(-10px) scale(1.03) !important;
-        box-shadow: var(--shadow-heavy) !important;
-        border-color: var(--accent-brown) !important;
-        background: var(--primary-cream) !important;
-    }
-    
-    .feature-box:hover::before {
-        transform: scaleX(1);
-    }
-    
-    @keyframes featureSlideUp {
-        from { 
-            opacity: 0; 
-            transform: translateY(30px) scale(0.9);
-        }
-        to { 
-            opacity: 1; 
-            transform: translateY(0) scale(1);
-        }
-    }
-    
-    .feature-icon {
-        font-size: 3rem !important;
-        margin-bottom: 1.5rem !important;
-        color: var(--accent-brown) !important;
-        animation: iconBounce 2s ease-in-out infinite;
-        display: inline-block;
-    }
-    
-    @keyframes iconBounce {
-        0%, 100% { transform: translateY(0) scale(1); }
-        50% { transform: translateY(-5px) scale(1.1); }
-    }
-    
-    .feature-title {
-        font-weight: 700 !important;
-        font-size: 1.2rem !important;
-        color: var(--text-dark) !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    .feature-description {
-        color: var(--text-medium) !important;
-        font-size: 0.95rem !important;
-        line-height: 1.6 !important;
-        opacity: 0.9;
-    }
-    
-    /* Results section with dramatic entrance */
-    .results-card {
-        background: var(--text-light) !important;
-        border-radius: 20px !important;
-        border: 1px solid var(--rich-cream) !important;
-        padding: 3rem !important;
-        box-shadow: var(--shadow-medium) !important;
-        min-height: 400px !important;
-        animation: resultsSlideIn 0.8s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .results-card::before {
-        content: '';
-        position: absolute;
-        top: -2px;
-        left: -2px;
-        right: -2px;
-        bottom: -2px;
-        background: var(--gradient-rich);
-        border-radius: 22px;
-        z-index: -1;
-        animation: borderGlow 3s ease-in-out infinite;
-    }
-    
-    @keyframes resultsSlideIn {
-        from { 
-            opacity: 0; 
-            transform: translateY(50px) scale(0.95);
-            filter: blur(5px);
-        }
-        to { 
-            opacity: 1; 
-            transform: translateY(0) scale(1);
-            filter: blur(0);
-        }
-    }
-    
-    @keyframes borderGlow {
-        0%, 100% { opacity: 0.5; }
-        50% { opacity: 1; }
-    }
-    
-    .info-label {
-        font-weight: 700 !important;
-        color: var(--accent-brown) !important;
-        font-size: 1.3rem !important;
-        margin-top: 2rem !important;
-        margin-bottom: 1rem !important;
-        position: relative;
-        padding-left: 2rem;
-    }
-    
-    .info-label::before {
-        content: '';
-        position: absolute;
-        left: 0;
-        top: 50%;
-        transform: translateY(-50%);
-        width: 1rem;
-        height: 0.3rem;
-        background: var(--gradient-rich);
-        border-radius: 2px;
-        animation: labelSlide 0.5s ease-out;
-    }
-    
-    @keyframes labelSlide {
-        from { width: 0; }
-        to { width: 1rem; }
-    }
-    
-    /* Text styling with subtle animations */
-    .stMarkdown, .stText, p, div, span {
-        color: var(--text-dark) !important;
-        transition: color 0.3s ease;
-    }
-    
-    /* Enhanced input fields */
-    .stTextArea > div > div > textarea,
-    .stTextInput > div > div > input,
-    .stSelectbox > div > div > select {
-        background: var(--primary-cream) !important;
-        color: var(--text-dark) !important;
-        border: 2px solid var(--rich-cream) !important;
-        border-radius: 12px !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        font-size: 1rem !important;
-        padding: 0.8rem !important;
-    }
-    
-    .stTextArea > div > div > textarea:focus,
-    .stTextInput > div > div > input:focus,
-    .stSelectbox > div > div > select:focus {
-        border-color: var(--accent-brown) !important;
-        box-shadow: 0 0 0 4px rgba(139, 115, 85, 0.1) !important;
-        background: var(--text-light) !important;
-        transform: scale(1.02) !important;
-    }
-    
-    .stTextArea > div > div > textarea::placeholder,
-    .stTextInput > div > div > input::placeholder {
-        color: rgba(44, 36, 22, 0.5) !important;
-        font-style: italic;
-    }
-    
-    /* Label styling */
-    .stTextArea > label,
-    .stTextInput > label,
-    .stSelectbox > label {
-        color: var(--text-dark) !important;
-        font-weight: 600 !important;
-        font-size: 1.1rem !important;
-        margin-bottom: 0.5rem !important;
-    }
-    
-    /* Enhanced disclaimer */
-    .disclaimer-box {
-        background: rgba(139, 115, 85, 0.08) !important;
-        border: 1px solid var(--rich-cream) !important;
-        border-left: 5px solid var(--accent-brown) !important;
-        border-radius: 12px !important;
-        padding: 1.5rem !important;
-        margin: 1.5rem 0 !important;
-        color: var(--text-dark) !important;
-        animation: disclaimerSlide 0.6s ease-out 0.3s both;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .disclaimer-box::after {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        width: 0;
-        height: 100%;
-        background: rgba(139, 115, 85, 0.05);
-        animation: fillDisclaimer 2s ease-out 1s forwards;
-    }
-    
-    @keyframes disclaimerSlide {
-        from { 
-            opacity: 0; 
-            transform: translateX(-30px);
-        }
-        to { 
-            opacity: 1; 
-            transform: translateX(0);
-        }
-    }
-    
-    @keyframes fillDisclaimer {
-        from { width: 0; }
-        to { width: 100%; }
-    }
-    
-    /* Placeholder with breathing animation */
-    .placeholder-content {
-        display: flex !important;
-        flex-direction: column !important;
-        justify-content: center !important;
-        align-items: center !important;
-        height: 400px !important;
-        text-align: center !important;
-        background: var(--text-light) !important;
-        border-radius: 20px !important;
-        border: 3px dashed var(--rich-cream) !important;
-        animation: breathe 4s ease-in-out infinite;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .placeholder-content::before {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        transform: translate(-50%, -50%);
-        width: 200px;
-        height: 200px;
-        background: radial-gradient(circle, rgba(139, 115, 85, 0.05) 0%, transparent 70%);
-        border-radius: 50%;
-        animation: expandingCircle 6s ease-in-out infinite;
-    }
-    
-    @keyframes breathe {
-        0%, 100% { 
-            transform: scale(1);
-            border-color: var(--rich-cream);
-        }
-        50% { 
-            transform: scale(1.02);
-            border-color: var(--accent-brown);
-        }
-    }
-    
-    @keyframes expandingCircle {
-        0%, 100% { 
-            transform: translate(-50%, -50%) scale(0.8);
-            opacity: 0.3;
-        }
-        50% { 
-            transform: translate(-50%, -50%) scale(1.2);
-            opacity: 0.1;
-        }
-    }
-    
-    .placeholder-icon {
-        font-size: 4.5rem !important;
-        margin-bottom: 1.5rem !important;
-        color: var(--accent-brown) !important;
-        animation: iconFloat 3s ease-in-out infinite;
-        position: relative;
-        z-index: 1;
-    }
-    
-    @keyframes iconFloat {
-        0%, 100% { transform: translateY(0) rotate(0deg); }
-        50% { transform: translateY(-10px) rotate(5deg); }
-    }
-    
-    .placeholder-title {
-        font-weight: 700 !important;
-        font-size: 1.5rem !important;
-        color: var(--text-dark) !important;
-        margin-bottom: 1rem !important;
-        position: relative;
-        z-index: 1;
-    }
-    
-    .placeholder-description {
-        color: var(--text-medium) !important;
-        font-size: 1.1rem !important;
-        line-height: 1.6 !important;
-        opacity: 0.8;
-        position: relative;
-        z-index: 1;
-    }
-    
-    /* Loading animation with cream theme */
-    .loading-spinner {
-        animation: spin 1s linear infinite;
-        width: 40px;
-        height: 40px;
-        border: 4px solid var(--rich-cream);
-        border-top: 4px solid var(--accent-brown);
-        border-radius: 50%;
-        margin: 30px auto;
-    }
-    
-    @keyframes spin {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
-    }
-    
-    /* Footer with subtle animation */
-    .footer {
-        text-align: center !important;
-        margin-top: 4rem !important;
-        padding-top: 2.5rem !important;
-        border-top: 2px solid var(--rich-cream) !important;
-        color: var(--text-medium) !important;
-        font-size: 0.9rem !important;
-        opacity: 0;
-        animation: footerFadeIn 1s ease-out 2s forwards;
-        position: relative;
-    }
-    
-    .footer::before {
-        content: '';
-        position: absolute;
-        top: -2px;
-        left: 50%;
-        transform: translateX(-50%);
-        width: 0;
-        height: 2px;
-        background: var(--gradient-rich);
-        animation: footerLineGrow 1s ease-out 2.5s forwards;
-    }
-    
-    @keyframes footerFadeIn {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 0.9; transform: translateY(0); }
-    }
-    
-    @keyframes footerLineGrow {
-        from { width: 0; }
-        to { width: 100px; }
-    }
-    
-    /* Responsive design with enhanced mobile experience */
-    @media (max-width: 768px) {
-        .main-header {
-            font-size: 2.5rem !important;
-            animation: mobileTypewriter 1.5s steps(15, end), blink 0.8s step-end infinite alternate;
-        }
-        
-        @keyframes mobileTypewriter {
-            from { width: 0; }
-            to { width: 100%; }
-        }
-        
-        .glass-card, .input-section, .results-card {
-            padding: 2rem !important;
-        }
-        
-        .feature-box {
-            margin-bottom: 1.5rem !important;
-            padding: 1.5rem !important;
-        }
-        
-        .main .block-container {
-            padding: 2rem !important;
-        }
-        
-        .tagline, .dark-tagline {
-            font-size: 1.1rem !important;
-            padding: 0.8rem 1.5rem !important;
-        }
-        
-        .particles {
-            display: none; /* Hide particles on mobile for better performance */
-        }
-    }
-    
-    /* Scroll animations */
-    @media (prefers-reduced-motion: no-preference) {
-        .scroll-animate {
-            opacity: 0;
-            transform: translateY(30px);
-            transition: all 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-        
-        .scroll-animate.visible {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    /* High contrast mode support */
-    @media (prefers-contrast: high) {
-        :root {
-            --primary-cream: #FFFFFF;
-            --secondary-cream: #F0F0F0;
-            --warm-cream: #E0E0E0;
-            --rich-cream: #D0D0D0;
-            --accent-brown: #000000;
-            --dark-brown: #333333;
-            --text-dark: #000000;
-            --text-medium: #333333;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Enhanced floating particles with cream theme
-st.markdown("""
-<div class="particles" id="particles-js"></div>
-<script>
-    // Create enhanced floating particles
-    document.addEventListener('DOMContentLoaded', function() {
-        const particles = document.querySelector('.particles');
-        if (!particles) return;
-        
-        const colors = ['#FFF8E7', '#F5F0E1', '#F0E8D6', '#E8DCC0', '#D4C4A8'];
-        const shapes = ['circle', 'square', 'triangle'];
-        
-        // Clear existing particles
-        particles.innerHTML = '';
-        
-        // Create more sophisticated particles
-        for (let i = 0; i < 40; i++) {
-            const particle = document.createElement('div');
-            particle.classList.add('particle');
-            
-            // Random properties with more variation
-            const size = Math.random() * 20 + 8;
-            const posX = Math.random() * 100;
-            const posY = Math.random() * 100 + 100;
-            const duration = Math.random() * 25 + 15;
-            const delay = Math.random() * 8;
-            const color = colors[Math.floor(Math.random() * colors.length)];
-            const opacity = Math.random() * 0.3 + 0.1;
-            
-            // Apply styles
-            particle.style.width = `${size}px`;
-            particle.style.height = `${size}px`;
-            particle.style.left = `${posX}%`;
-            particle.style.top = `${posY}%`;
-            particle.style.animationDuration = `${duration}s`;
-            particle.style.animationDelay = `${delay}s`;
-            particle.style.backgroundColor = color;
-            particle.style.opacity = opacity;
-            
-            // Add slight variations
-            if (Math.random() > 0.7) {
-                particle.style.borderRadius = '20%';
-            }
-            if (Math.random() > 0.8) {
-                particle.style.filter = 'blur(2px)';
-            }
-            
-            particles.appendChild(particle);
-        }
-        
-        // Add scroll animations
-        const observerOptions = {
-            threshold: 0.1,
-            rootMargin: '0px 0px -50px 0px'
-        };
-        
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    entry.target.classList.add('visible');
-                }
-            });
-        }, observerOptions);
-        
-        // Observe elements for scroll animations
-        document.querySelectorAll('.scroll-animate').forEach(el => {
-            observer.observe(el);
-        });
-    });
-</script>
-""", unsafe_allow_html=True)
+# The theme stylesheet is installed in the page head on a session's first run; reruns only send the particles container
+if not st.session_state.get("theme_installed"):
+    components.html(theme_injection(), height=0)
+    st.session_state.theme_installed = True
+st.markdown(theme_tags(), unsafe_allow_html=True)
 
 # API Keys from Streamlit secrets
 try:
@@ -985,116 +57,236 @@ if not TAVILY_API_KEY or not GOOGLE_API_KEY:
     st.error("API keys are missing or empty. Please check your secrets configuration.")
     st.stop()
 
-SYSTEM_PROMPT = """
-You are an expert career counselor and job market analyst with deep knowledge of various industries, job roles, and skill requirements.
-Your role is to analyze a person's skills and provide comprehensive job matching analysis based on real-time market data.
+# Render the report incrementally as tokens arrive instead of waiting for the full response
+STREAM_RESULTS = os.environ.get("STREAM_RESULTS", "1") == "1"
+# "single" runs one agent over the whole report; "parallel" runs the four sections concurrently
+ANALYSIS_MODE = os.environ.get("ANALYSIS_MODE", "single")
+# Upper bound on concurrently running agents; further analyses queue for a free one, for at most
+# AGENT_CHECKOUT_TIMEOUT seconds or what is left of their ANALYSIS_DEADLINE, whichever is shorter
+AGENT_POOL_SIZE = int(os.environ.get("AGENT_POOL_SIZE", 8))
+AGENT_CHECKOUT_TIMEOUT = int(os.environ.get("AGENT_CHECKOUT_TIMEOUT", 300))
+# Per-analysis time (seconds) and live-search budget; when exhausted the agent answers with what it has
+ANALYSIS_DEADLINE = float(os.environ.get("ANALYSIS_DEADLINE", 90))
+SEARCH_BUDGET = int(os.environ.get("SEARCH_BUDGET", 8))
+# Prometheus /metrics endpoint on localhost; 0 disables it
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 9464))
+# Analyses run as background jobs; sessions poll them every JOB_POLL_INTERVAL seconds, and a job
+# nobody has polled for JOB_ABANDON_AFTER seconds (closed tab) is cancelled
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 1.0))
+JOB_ABANDON_AFTER = float(os.environ.get("JOB_ABANDON_AFTER", 60))
+JOB_FAST_PATH = 0.5
+# "thread" runs analyses in this process; "queue" hands them to worker.py processes through the durable queue
+ANALYSIS_BACKEND = os.environ.get("ANALYSIS_BACKEND", "thread")
+# Re-submitting with a few fields changed only regenerates the report sections that depend on them
+INCREMENTAL_RESULTS = os.environ.get("INCREMENTAL_RESULTS", "1") == "1"
+# Seconds between checks of a report PDF still rendering; Save Report appears on the first check after it is done
+PDF_POLL_INTERVAL = float(os.environ.get("PDF_POLL_INTERVAL", 0.5))
 
-You have access to web search tools to gather the latest information about:
-- Current job market trends
-- Specific job role requirements
-- Company hiring practices and salary ranges
-- Skill gap analysis for different roles
-- Industry-specific requirements
+@st.cache_resource
+def get_metrics_server():
+    """Start the process-wide metrics endpoint once."""
+    return start_metrics_server(METRICS_PORT) if METRICS_PORT else None
 
-Always provide accurate, up-to-date information based on real market data, never use synthetic or placeholder information.
-Focus on actionable insights that can help the person make informed career decisions.
-"""
+@st.cache_resource
+def get_result_cache():
+    """Open the on-disk analysis cache shared by all sessions."""
+    return open_result_cache()
 
-INSTRUCTIONS = """
-Based on the user's skills, perform the following analysis using web search to gather real-time data:
+@st.cache_resource
+def get_search_cache():
+    """Open the on-disk Tavily search cache shared by all sessions and replicas on this host."""
+    return open_search_cache()
 
-1. **Eligible Job Roles Analysis:**
-   - Search for current job openings that match the user's skills
-   - Identify specific job titles and roles they qualify for
-   - Provide detailed job descriptions and responsibilities
-   - Include both entry-level and advanced positions based on skill level
+@st.cache_resource
+def get_similar_index():
+    """Open the near-duplicate profile index beside the result cache, unless disabled."""
+    return open_similar_index()
 
-2. **Skill Gap Analysis:**
-   - Compare user's skills with requirements for desired/relevant job roles
-   - Identify specific skills that are missing or need improvement
-   - Prioritize skill gaps based on market demand and career impact
-   - Suggest learning resources and certification programs
+@st.cache_resource
+def get_single_flight():
+    """Process-wide coalescer for identical in-flight analyses."""
+    return SingleFlight()
 
-3. **Company and Opportunity Analysis:**
-   - Search for companies actively hiring for relevant roles
-   - Include company names, sizes, and industries
-   - Provide information about company culture and work environment
-   - Include both established companies and startups
+@st.cache_resource
+def get_job_index():
+    """Open the local job-posting index if one has been built with job_index.py."""
+    return JobIndex(JOB_INDEX_PATH) if os.path.exists(JOB_INDEX_PATH) else None
 
-4. **Salary and Package Analysis:**
-   - Research current salary ranges for identified job roles
-   - Include base salary, bonuses, and benefits information
-   - Consider geographic location and experience level
-   - Provide salary progression paths
+@st.cache_resource
+def get_role_matcher():
+    """Load the role taxonomy matrix shared by all sessions, if the taxonomy file exists."""
+    return RoleMatcher.load(ROLE_TAXONOMY_PATH) if os.path.exists(ROLE_TAXONOMY_PATH) else None
 
-Return all information in a structured format:
-*Eligible Job Roles:* <detailed list with specific roles, requirements, and market demand>
-*Skill Gap Analysis:* <specific skills missing, priority levels, and learning recommendations>
-*Companies Hiring:* <company names, role details, and application information>
-*Salary Packages:* <current market rates, ranges, and progression paths>
+@st.cache_resource(ttl=3600)
+def get_salary_store():
+    """Memory-map the current salary store version; reopened hourly to pick up refreshes."""
+    return SalaryStore.open()
 
-Ensure all information is current, accurate, and based on real market data from your web searches.
-"""
+@st.cache_resource
+def get_pdf_exporter():
+    """Background PDF renderer whose output is shared by all sessions."""
+    return PdfExporter()
 
 @st.cache_resource
-def get_agent():
-    """Initialize and cache the AI agent."""
-    try:
-        return Agent(
-            model=Gemini(id="gemini-2.0-flash-exp", api_key=GOOGLE_API_KEY),
-            system_prompt=SYSTEM_PROMPT,
-            instructions=INSTRUCTIONS,
-            tools=[TavilyTools(api_key=TAVILY_API_KEY)],
-            markdown=True,
+def get_agent_stack_preloader():
+    """Import the model and search stacks on a background thread, once per process.
+
+    Started after the page has been sent, so a fresh worker paints the form
+    first and usually has the stacks loaded by the time Analyze is clicked.
+    """
+    thread = threading.Thread(target=preload_agent_stack, name="agent-stack-preload", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def get_job_manager():
+    """Process-wide executor for background analysis jobs, or the shared queue in queue mode."""
+    if ANALYSIS_BACKEND == "queue":
+        return JobQueue()
+    return JobManager(max_workers=AGENT_POOL_SIZE, abandon_after=JOB_ABANDON_AFTER)
+
+@st.cache_resource
+def get_agent_pool():
+    """Create the process-wide pool of isolated agents."""
+    def build_agent():
+        with timed("agent_create"):
+            return create_agent(GOOGLE_API_KEY, TAVILY_API_KEY, get_search_cache())
+
+    return AgentPool(
+        build_agent,
+        size=AGENT_POOL_SIZE,
+        checkout_timeout=AGENT_CHECKOUT_TIMEOUT,
+    )
+
+def analyze_job_match(skills, experience_level, preferred_location, career_goals, previous=None):
+    """Submit the analysis as a background job and return its id.
+
+    Shared resources are resolved here on the script thread; the job itself
+    only streams the report into job.text for render_job_progress() to poll.
+    In queue mode the profile is enqueued for worker.py processes instead.
+    previous is the session's last report and its inputs, whose unaffected
+    sections are reused.
+    """
+    # The request log feeds the off-peak cache warm-up (warmup.py) with the most popular profiles
+    log_event(
+        "request",
+        skills=skills_signature(skills) or skills,
+        experience_level=experience_level,
+        preferred_location=preferred_location,
+        career_goals=career_goals,
+        mode=ANALYSIS_MODE,
+    )
+    if ANALYSIS_BACKEND == "queue":
+        # Workers open their own caches and local data; the job only carries the profile and limits
+        return get_job_manager().enqueue({
+            "skills": skills,
+            "experience_level": experience_level,
+            "preferred_location": preferred_location,
+            "career_goals": career_goals,
+            "mode": ANALYSIS_MODE,
+            "stream": STREAM_RESULTS,
+            "deadline": ANALYSIS_DEADLINE,
+            "max_tool_calls": SEARCH_BUDGET,
+            "previous": previous,
+        })
+    pool, result_cache, single_flight = get_agent_pool(), get_result_cache(), get_single_flight()
+    grounding = {
+        "job_index": get_job_index(),
+        "role_matcher": get_role_matcher(),
+        "salary_store": get_salary_store(),
+        "similar_index": get_similar_index(),
+    }
+
+    def run(job):
+        def show_progress(text):
+            job.text = text
+
+        return analyze_profile(
+            pool,
+            result_cache,
+            skills,
+            experience_level,
+            preferred_location,
+            career_goals,
+            mode=ANALYSIS_MODE,
+            stream=STREAM_RESULTS,
+            on_progress=show_progress,
+            single_flight=single_flight,
+            budget=job.budget,
+            previous=previous,
+            **grounding,
         )
-    except Exception as e:
-        st.error(f"Error initializing agent: {e}")
-        return None
 
-def analyze_job_match(skills, experience_level, preferred_location, career_goals):
-    """Analyze job matching based on user's skills and preferences."""
-    agent = get_agent()
-    if agent is None:
-        return None
+    return get_job_manager().submit(run, deadline=ANALYSIS_DEADLINE, max_tool_calls=SEARCH_BUDGET)
 
-    try:
-        # Create comprehensive query for the agent
-        query = f"""
-        Analyze job opportunities for a candidate with the following profile:
-        
-        Skills: {skills}
-        Experience Level: {experience_level}
-        Preferred Location: {preferred_location}
-        Career Goals: {career_goals}
-        
-        Please provide a comprehensive job market analysis including eligible roles, skill gaps, hiring companies, and salary information.
-        Use current market data from job portals, company websites, and industry reports.
-        """
-        
-        with st.spinner("🔍 Analyzing job market and matching opportunities..."):
-            # Add custom spinner with cream theme
-            st.markdown("""
-            <div style="display: flex; justify-content: center; align-items: center; padding: 2rem;">
-                <div class="loading-spinner"></div>
-            </div>
-            <div style="text-align: center; color: var(--accent-brown); font-weight: 600; font-size: 1.1rem; margin-top: 1rem;">
-                ✨ Discovering your perfect career matches...
-            </div>
-            """, unsafe_allow_html=True)
-            
-            response = agent.run(query)
-            return response.content.strip()
-    except Exception as e:
-        st.error(f"Error analyzing job match: {e}")
-        return None
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_job_progress():
+    """Live progress of this session's analysis job, polled without re-running the page.
 
-def main():
-    # Initialize session state
-    if 'analyze_clicked' not in st.session_state:
-        st.session_state.analyze_clicked = False
-    if 'analysis_results' not in st.session_state:
-        st.session_state.analysis_results = None
+    Once the job finishes its outcome is moved into session state and the
+    whole page re-runs to show the results.
+    """
+    job = get_job_manager().get(st.session_state.job_id)
+    if job is None or job.finished:
+        st.session_state.job_id = None
+        if job is not None:
+            st.session_state.job_outcome = {"status": job.status, "error": job.error}
+            st.session_state.analysis_results = job.result if job.status == "done" else None
+            if st.session_state.analysis_results:
+                # Render the PDF while the page re-runs, so Save Report is usually ready when drawn
+                get_pdf_exporter().submit(st.session_state.analysis_results)
+        st.rerun()
+    progress = job.progress()
+    report = parse_report(progress["text"], memoize=False)
+    sections_done = len(report.sections())
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.markdown("""
+        <div style="text-align: center; margin: 2rem 0; padding: 1.5rem; background: var(--primary-cream); border-radius: 15px; border: 1px solid var(--rich-cream);">
+            <div style="font-size: 1.3rem; font-weight: 600; color: var(--accent-brown); margin-bottom: 0.5rem;">🔮 AI Analysis in Progress</div>
+            <div style="color: var(--text-medium); font-size: 1rem;">Our AI is scanning thousands of job opportunities and market trends to find your perfect matches...</div>
+        </div>
+        """, unsafe_allow_html=True)
+        status = "⏳ Waiting for a free analyst..." if progress["status"] == "queued" else "🔍 Analyzing job market and matching opportunities..."
+        st.progress(
+            sections_done / len(SECTION_KEYS),
+            text=f"{status} {progress['tool_calls']} web searches • {sections_done}/{len(SECTION_KEYS)} sections • {progress['elapsed']:.0f}s",
+        )
+        if st.button("⏹️ Cancel Analysis", key="cancel_btn", use_container_width=True):
+            get_job_manager().cancel(job.id)
+    if progress["text"]:
+        st.markdown(f"<div class='results-card'>{render_report_html(report)}</div>", unsafe_allow_html=True)
+    else:
+        # Add custom spinner with cream theme
+        st.markdown("""
+        <div style="display: flex; justify-content: center; align-items: center; padding: 2rem;">
+            <div class="loading-spinner"></div>
+        </div>
+        <div style="text-align: center; color: var(--accent-brown); font-weight: 600; font-size: 1.1rem; margin-top: 1rem;">
+            ✨ Discovering your perfect career matches...
+        </div>
+        """, unsafe_allow_html=True)
 
+def show_job_outcome(outcome):
+    """One-off status message for a job that finished since the last full rerun."""
+    if outcome is None:
+        return
+    analysis_result = st.session_state.analysis_results
+    if outcome["status"] == "failed":
+        st.error(f"Error analyzing job match: {outcome['error']}")
+    elif outcome["status"] == "cancelled":
+        st.info("⏹️ Analysis cancelled.")
+    elif is_partial(analysis_result):
+        st.warning("⏱️ The analysis reached its time or search limit, so this report is partial. Try again later for a complete one.")
+    elif is_similar(analysis_result):
+        st.info("♻️ A closely matching profile was analyzed recently, so its report is shown instantly.")
+    elif analysis_result:
+        st.success("✨ Analysis complete! Your personalized career roadmap is ready below.")
+        st.balloons()  # Celebratory animation
+
+def render_header():
+    """Header and disclaimer."""
     # Header with enhanced animation
     st.markdown('<div class="main-header">🚀 AI Career Navigator</div>', unsafe_allow_html=True)
     st.markdown("""
@@ -1115,139 +307,114 @@ def main():
         </div>
     </div>
     """, unsafe_allow_html=True)
-    
-    # Input Section with enhanced styling
-    st.markdown('<div class="tagline">🎯 Unlock your career potential with AI-powered insights!</div>', unsafe_allow_html=True)
-    
-    st.markdown('<div class="input-section scroll-animate">', unsafe_allow_html=True)
-    
-    # Enhanced skills input with better UX
-    skills = st.text_area(
-        "🛠️ Your Professional Skills & Expertise",
-        placeholder="e.g., Python, JavaScript, React, SQL, Machine Learning, Project Management, Data Analysis, Leadership, Communication, Problem Solving...",
-        height=120,
-        help="💡 Include both technical skills (programming languages, tools, software) and soft skills (leadership, communication, teamwork). The more detailed, the better your matches!"
-    )
-    
-    # Experience level with enhanced options
-    experience_level = st.selectbox(
-        "📊 Professional Experience Level",
-        [
-            "🌱 Entry Level (0-2 years) - Recent graduate or career starter",
-            "🚀 Mid Level (2-5 years) - Developing expertise and taking on more responsibility", 
-            "⭐ Senior Level (5-10 years) - Experienced professional with proven track record",
-            "🎯 Expert Level (10+ years) - Industry leader with extensive experience"
-        ],
-        help="📈 Select the option that best describes your current professional standing"
-    )
-    
-    # Preferred location with enhanced input
-    preferred_location = st.text_input(
-        "📍 Preferred Work Location",
-        placeholder="e.g., New York, Remote, San Francisco, London, Hybrid (City Name)...",
-        help="🌍 Specify your ideal work location. You can mention 'Remote', specific cities, or 'Hybrid' options"
-    )
-    
-    # Career goals with better guidance
-    career_goals = st.text_area(
-        "🎯 Career Aspirations & Goals (Optional but Recommended)",
-        placeholder="e.g., Become a Senior Software Engineer at a tech startup, Transition into Data Science from finance, Lead a product team at a Fortune 500 company, Start my own consulting business...",
-        height=100,
-        help="🚀 Share your career dreams! This helps us provide more targeted recommendations and identify the right growth path for you"
+
+def pdf_for_results():
+    """PDF bytes of the current report, or None while it is still rendering."""
+    exporter = get_pdf_exporter()
+    # Usually submitted when the job finished; re-submitting is a no-op unless the exporter evicted it
+    exporter.submit(st.session_state.analysis_results)
+    return exporter.get(st.session_state.analysis_results)
+
+def render_save_report():
+    """Save Report download, or a placeholder that polls until the PDF is ready."""
+    try:
+        pdf_bytes = pdf_for_results()
+    except Exception as e:
+        st.error(f"Could not create the PDF report: {e}")
+        return
+    if pdf_bytes is None:
+        poll_save_report()
+        return
+    st.download_button(
+        "📄 Save Report",
+        data=pdf_bytes,
+        file_name="career-intelligence-report.pdf",
+        mime="application/pdf",
+        use_container_width=True,
     )
-    
-    # Enhanced analyze button
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        if st.button("🔍 Discover My Career Opportunities", key="analyze_btn", use_container_width=True):
-            if skills.strip():
-                st.session_state.analyze_clicked = True
-                
-                # Perform analysis with enhanced feedback
+
+@st.fragment(run_every=PDF_POLL_INTERVAL)
+def poll_save_report():
+    """Disabled placeholder re-run on its own until the PDF is ready, then one full rerun draws the button."""
+    try:
+        ready = not st.session_state.analysis_results or pdf_for_results() is not None
+    except Exception:
+        # The full rerun shows the render error
+        ready = True
+    if ready:
+        st.rerun()
+    st.button("📄 Preparing PDF...", disabled=True, use_container_width=True)
+
+def clear_results():
+    """New Analysis click: drop the report before the results fragment re-runs."""
+    st.session_state.analysis_results = None
+    st.session_state.analyze_clicked = False
+
+@st.fragment
+def render_results():
+    """Results card and its actions, re-run on their own when a result button is clicked.
+
+    Counted under scope="results" on every run, so fragment-only reruns are
+    the results count minus the app count.
+    """
+    with timed("rerun", scope="results"):
+        if st.session_state.analysis_results:
+            st.markdown('<div class="results-card scroll-animate">', unsafe_allow_html=True)
+            st.markdown("""
+            <div style="text-align: center; margin-bottom: 2.5rem;">
+                <div style="font-size: 2.2rem; font-weight: 800; color: var(--accent-brown); margin-bottom: 0.5rem;">✨ Your Career Intelligence Report</div>
+                <div style="font-size: 1.1rem; color: var(--text-medium); opacity: 0.9;">Powered by real-time market data and AI analysis</div>
+                <div style="width: 80px; height: 3px; background: var(--gradient-rich); margin: 1rem auto; border-radius: 2px;"></div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+            with timed("render"):
+                # Parsed once per distinct result; reruns reuse the memoized report and section fragments
+                report = parse_report(st.session_state.analysis_results)
+            
+                # Add download option for results
                 st.markdown("""
-                <div style="text-align: center; margin: 2rem 0; padding: 1.5rem; background: var(--primary-cream); border-radius: 15px; border: 1px solid var(--rich-cream);">
-                    <div style="font-size: 1.3rem; font-weight: 600; color: var(--accent-brown); margin-bottom: 0.5rem;">🔮 AI Analysis in Progress</div>
-                    <div style="color: var(--text-medium); font-size: 1rem;">Our AI is scanning thousands of job opportunities and market trends to find your perfect matches...</div>
-                </div>
+                <div style="background: var(--primary-cream); padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem; border: 1px solid var(--rich-cream);">
                 """, unsafe_allow_html=True)
-                
-                analysis_result = analyze_job_match(skills, experience_level, preferred_location, career_goals)
-                st.session_state.analysis_results = analysis_result
-                
-                if analysis_result:
-                    st.success("✨ Analysis complete! Your personalized career roadmap is ready below.")
-                    st.balloons()  # Celebratory animation
-            else:
-                st.error("⚠️ Please enter your skills to begin the career analysis.")
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Results Section with enhanced presentation
-    st.markdown('<div class="dark-tagline scroll-animate">📊 Your personalized career intelligence awaits!</div>', unsafe_allow_html=True)
-    
-    # Display results if available
-    if st.session_state.analysis_results:
-        st.markdown('<div class="results-card scroll-animate">', unsafe_allow_html=True)
-        st.markdown("""
-        <div style="text-align: center; margin-bottom: 2.5rem;">
-            <div style="font-size: 2.2rem; font-weight: 800; color: var(--accent-brown); margin-bottom: 0.5rem;">✨ Your Career Intelligence Report</div>
-            <div style="font-size: 1.1rem; color: var(--text-medium); opacity: 0.9;">Powered by real-time market data and AI analysis</div>
-            <div style="width: 80px; height: 3px; background: var(--gradient-rich); margin: 1rem auto; border-radius: 2px;"></div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Enhanced formatting with better visual hierarchy
-        formatted_info = st.session_state.analysis_results.replace(
-            "*Eligible Job Roles:*", "<div class='info-label'>🎯 Perfect Job Matches for You</div>"
-        ).replace(
-            "*Skill Gap Analysis:*", "<div class='info-label'>📈 Skills Development Roadmap</div>"
-        ).replace(
-            "*Companies Hiring:*", "<div class='info-label'>🏢 Companies Looking for Your Talents</div>"
-        ).replace(
-            "*Salary Packages:*", "<div class='info-label'>💰 Earning Potential & Compensation</div>"
-        )
-        
-        # Add download option for results
-        st.markdown("""
-        <div style="background: var(--primary-cream); padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem; border: 1px solid var(--rich-cream);">
-        """, unsafe_allow_html=True)
-        
-        st.markdown(formatted_info, unsafe_allow_html=True)
+            
+                if report.preamble:
+                    st.markdown(report.preamble, unsafe_allow_html=True)
+                for key, body in report.sections():
+                    st.markdown(render_section_html(key, body), unsafe_allow_html=True)
+            
+                st.markdown("</div>", unsafe_allow_html=True)
         
-        st.markdown("</div>", unsafe_allow_html=True)
+            # Add action buttons
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                render_save_report()
+            with col2:
+                # Cleared in the click callback, so the fragment's own rerun already draws the placeholder
+                st.button("🔄 New Analysis", key="new_analysis_btn", on_click=clear_results, use_container_width=True)
+            with col3:
+                if st.button("📧 Share Results", key="share_btn", use_container_width=True):
+                    st.info("💡 Copy the URL to share your results, or use 📄 Save Report to download them as a PDF!")
         
-        # Add action buttons
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            if st.button("📄 Save Report", use_container_width=True):
-                st.info("💡 Tip: Use your browser's print function (Ctrl+P) to save this report as PDF!")
-        with col2:
-            if st.button("🔄 New Analysis", use_container_width=True):
-                st.session_state.analysis_results = None
-                st.session_state.analyze_clicked = False
-                st.rerun()
-        with col3:
-            if st.button("📧 Share Results", use_container_width=True):
-                st.info("💡 Copy the URL to share your results, or use the print function to create a PDF!")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    else:
-        st.markdown("""
-        <div class="placeholder-content scroll-animate">
-            <div class="placeholder-icon">🎯</div>
-            <div class="placeholder-title">Ready to Discover Your Dream Career?</div>
-            <div class="placeholder-description">
-                Enter your skills and preferences above, then click "Discover My Career Opportunities" to unlock personalized insights powered by real-time market data and AI analysis.
-                <br><br>
-                <strong>✨ Get ready to explore:</strong><br>
-                • Perfect job matches tailored to your skills<br>
-                • Skills development roadmap for growth<br>
-                • Companies actively seeking your talents<br>
-                • Real salary data and earning potential
+            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div class="placeholder-content scroll-animate">
+                <div class="placeholder-icon">🎯</div>
+                <div class="placeholder-title">Ready to Discover Your Dream Career?</div>
+                <div class="placeholder-description">
+                    Enter your skills and preferences above, then click "Discover My Career Opportunities" to unlock personalized insights powered by real-time market data and AI analysis.
+                    <br><br>
+                    <strong>✨ Get ready to explore:</strong><br>
+                    • Perfect job matches tailored to your skills<br>
+                    • Skills development roadmap for growth<br>
+                    • Companies actively seeking your talents<br>
+                    • Real salary data and earning potential
+                </div>
             </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
+            """, unsafe_allow_html=True)
+
+def render_features():
+    """Static feature boxes."""
     # Enhanced features section
     st.markdown("---")
     st.markdown("""
@@ -1298,7 +465,9 @@ def main():
             <div class="feature-description">Access real-time salary data, compensation packages, and career progression potential in your field</div>
         </div>
         """, unsafe_allow_html=True)
-    
+
+def render_footer():
+    """Footer."""
     # Enhanced footer
     st.markdown("""
     <div class="footer">
@@ -1310,5 +479,110 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+def render_page():
+    # Initialize session state
+    if 'analyze_clicked' not in st.session_state:
+        st.session_state.analyze_clicked = False
+    if 'analysis_results' not in st.session_state:
+        st.session_state.analysis_results = None
+    if 'job_id' not in st.session_state:
+        st.session_state.job_id = None
+    if 'analysis_inputs' not in st.session_state:
+        st.session_state.analysis_inputs = None
+
+    render_header()
+
+    # Input Section with enhanced styling
+    st.markdown('<div class="tagline">🎯 Unlock your career potential with AI-powered insights!</div>', unsafe_allow_html=True)
+    
+    st.markdown('<div class="input-section scroll-animate">', unsafe_allow_html=True)
+    
+    # Inputs are batched in a form: editing them causes no reruns until the button submits them all
+    with st.form("profile_form", border=False):
+        # Enhanced skills input with better UX
+        skills = st.text_area(
+            "🛠️ Your Professional Skills & Expertise",
+            placeholder="e.g., Python, JavaScript, React, SQL, Machine Learning, Project Management, Data Analysis, Leadership, Communication, Problem Solving...",
+            height=120,
+            help="💡 Include both technical skills (programming languages, tools, software) and soft skills (leadership, communication, teamwork). The more detailed, the better your matches!"
+        )
+    
+        # Experience level with enhanced options
+        experience_level = st.selectbox(
+            "📊 Professional Experience Level",
+            EXPERIENCE_LEVELS,
+            help="📈 Select the option that best describes your current professional standing"
+        )
+    
+        # Preferred location with enhanced input
+        preferred_location = st.text_input(
+            "📍 Preferred Work Location",
+            placeholder="e.g., New York, Remote, San Francisco, London, Hybrid (City Name)...",
+            help="🌍 Specify your ideal work location. You can mention 'Remote', specific cities, or 'Hybrid' options. List several, separated by commas, to compare them side by side"
+        )
+    
+        # Career goals with better guidance
+        career_goals = st.text_area(
+            "🎯 Career Aspirations & Goals (Optional but Recommended)",
+            placeholder="e.g., Become a Senior Software Engineer at a tech startup, Transition into Data Science from finance, Lead a product team at a Fortune 500 company, Start my own consulting business...",
+            height=100,
+            help="🚀 Share your career dreams! This helps us provide more targeted recommendations and identify the right growth path for you"
+        )
+    
+        # Enhanced analyze button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            submitted = st.form_submit_button("🔍 Discover My Career Opportunities", use_container_width=True)
+
+    if submitted:
+        if skills.strip():
+            st.session_state.analyze_clicked = True
+            # A new submission replaces the session's running analysis instead of queueing behind it
+            if st.session_state.job_id:
+                get_job_manager().cancel(st.session_state.job_id)
+            previous = None
+            if INCREMENTAL_RESULTS and st.session_state.analysis_results:
+                previous = {"inputs": st.session_state.analysis_inputs, "report": st.session_state.analysis_results}
+            st.session_state.analysis_inputs = {
+                "skills": skills,
+                "experience_level": experience_level,
+                "preferred_location": preferred_location,
+                "career_goals": career_goals,
+            }
+            st.session_state.analysis_results = None
+            st.session_state.job_id = analyze_job_match(
+                skills, experience_level, preferred_location, career_goals, previous=previous
+            )
+            # Cached reports finish almost at once; show them in this run instead of after the first poll
+            get_job_manager().get(st.session_state.job_id).wait(JOB_FAST_PATH)
+        else:
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                st.error("⚠️ Please enter your skills to begin the career analysis.")
+
+    if st.session_state.job_id:
+        render_job_progress()
+    else:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            show_job_outcome(st.session_state.pop("job_outcome", None))
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Results Section with enhanced presentation
+    st.markdown('<div class="dark-tagline scroll-animate">📊 Your personalized career intelligence awaits!</div>', unsafe_allow_html=True)
+    
+    render_results()
+    render_features()
+    render_footer()
+
+def main():
+    get_metrics_server()
+    # Full-script reruns and fragment reruns are timed separately in career_stage_seconds{stage="rerun"}
+    with timed("rerun", scope="app"):
+        render_page()
+    get_agent_stack_preloader()
+
+
 if __name__ == "__main__":
     main()
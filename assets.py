@@ -0,0 +1,79 @@
+"""Theme stylesheet installed once per session instead of inlined on every rerun.
+
+Streamlit's static route serves .css and .js as text/plain with nosniff, so
+browsers refuse them as stylesheets or scripts. Instead, theme_injection()
+returns a zero-height component whose script copies the minified theme.css
+into the parent page's <head> under a content-hashed id. The stylesheet
+outlives the component, so the app sends it on a session's first run only
+and later reruns send just theme_tags().
+
+    python assets.py --measure
+"""
+import argparse
+import functools
+import hashlib
+import json
+import os
+import re
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(BASE_DIR, "assets")
+# Bytes of the <style>, particles container and <script> the page inlined on every rerun before
+# the theme was installed once per session (the script never ran: st.markdown does not execute it)
+INLINE_BYTES_PER_RERUN = 23826
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _read_source(filename):
+    with open(os.path.join(SOURCE_DIR, filename), encoding="utf-8") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=1)
+def theme_injection():
+    """Component HTML that adds the minified theme to the parent page's <head>, once per page."""
+    css = minify_css(_read_source("theme.css"))
+    style_id = "career-theme-" + hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    return (
+        "<script>"
+        "const doc = window.parent.document;"
+        f"if (!doc.getElementById({json.dumps(style_id)})) {{"
+        "const style = doc.createElement('style');"
+        f"style.id = {json.dumps(style_id)};"
+        f"style.textContent = {json.dumps(css)};"
+        "doc.head.appendChild(style);"
+        "}"
+        "</script>"
+    )
+
+
+def theme_tags():
+    """Markup sent on every rerun: the particles container the theme styles."""
+    return '<div class="particles" id="particles-js"></div>'
+
+
+def measure():
+    """Bytes of theme markup sent per rerun before and after, plus the once-per-session injection."""
+    return {
+        "inline_bytes_per_rerun": INLINE_BYTES_PER_RERUN,
+        "tag_bytes_per_rerun": len(theme_tags().encode("utf-8")),
+        "injection_bytes_per_session": len(theme_injection().encode("utf-8")),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the theme markup sent per rerun.")
+    parser.add_argument("--measure", action="store_true", help="Report bytes sent per rerun before and after")
+    args = parser.parse_args()
+    if args.measure:
+        for name, value in measure().items():
+            print(f"{name}: {value}")
+    else:
+        print(theme_injection())
@@ -0,0 +1,228 @@
+"""Headless batch analysis of candidate profiles.
+
+Reads a CSV or JSONL file with the columns skills, experience_level,
+preferred_location and career_goals (plus an optional id column), runs every
+profile through the same analysis pipeline as the web app and appends one
+JSON line per finished profile. Re-running the same command resumes where the
+previous run stopped.
+
+    python batch.py profiles.csv results.jsonl --workers 4 --rate 30
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: keys must come from the environment
+    tomllib = None
+
+from advisor import analyze_profile, create_agent
+from agent_pool import AgentPool
+from budget import is_partial
+from cache import open_result_cache, open_search_cache
+from job_index import JobIndex
+from role_matcher import DEFAULT_TAXONOMY_PATH as ROLE_TAXONOMY_PATH, RoleMatcher
+from salary_store import DEFAULT_STORE_DIR as SALARY_STORE_DIR, SalaryStore
+from similar_cache import open_similar_index
+from singleflight import SingleFlight
+from skills import canonicalize_skills
+
+PROFILE_FIELDS = ["skills", "experience_level", "preferred_location", "career_goals"]
+SECRETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+
+
+def load_api_keys():
+    """Read API keys from the environment, falling back to the Streamlit secrets file."""
+    keys = {name: os.environ.get(name) for name in ("GOOGLE_API_KEY", "TAVILY_API_KEY")}
+    if not all(keys.values()) and tomllib is not None and os.path.exists(SECRETS_PATH):
+        with open(SECRETS_PATH, "rb") as f:
+            secrets = tomllib.load(f)
+        keys = {name: value or secrets.get(name) for name, value in keys.items()}
+    missing = [name for name, value in keys.items() if not value]
+    if missing:
+        raise SystemExit(f"Missing API keys: {', '.join(missing)} (set them in the environment or {SECRETS_PATH})")
+    return keys["GOOGLE_API_KEY"], keys["TAVILY_API_KEY"]
+
+
+class RateLimiter:
+    """Space out call starts so at most rate calls begin per minute."""
+
+    def __init__(self, rate):
+        self.interval = 60.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(max(0.0, start - now))
+
+
+def read_profiles(path):
+    """Load profiles from CSV or JSONL into a DataFrame with an id column."""
+    if path.endswith((".jsonl", ".ndjson")):
+        frame = pd.read_json(path, lines=True, dtype=False)
+    else:
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = [field for field in PROFILE_FIELDS if field not in frame.columns and field != "career_goals"]
+    if missing:
+        raise SystemExit(f"Input is missing required columns: {', '.join(missing)}")
+    for field in PROFILE_FIELDS:
+        if field not in frame.columns:
+            frame[field] = ""
+        frame[field] = frame[field].fillna("").astype(str)
+    if "id" not in frame.columns:
+        frame["id"] = frame.index.astype(str)
+    frame["id"] = frame["id"].astype(str)
+    return frame
+
+
+def completed_ids(checkpoint_path):
+    """Ids already written with a complete result by a previous run."""
+    done = set()
+    if not os.path.exists(checkpoint_path):
+        return done
+    with open(checkpoint_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash; the profile is simply retried
+                continue
+            if record.get("result") and not record.get("error") and not is_partial(record["result"]):
+                done.add(str(record["id"]))
+    return done
+
+
+def run_batch(
+    input_path,
+    output_path,
+    workers=4,
+    rate=0,
+    mode="single",
+    deadline=None,
+    max_tool_calls=None,
+    job_index_path=None,
+    salary_store_dir=SALARY_STORE_DIR,
+    similar_threshold=0,
+):
+    """Analyze every pending profile and stream results to output_path."""
+    checkpoint_path = output_path if output_path.endswith(".jsonl") else output_path + ".partial.jsonl"
+    frame = read_profiles(input_path)
+    done = completed_ids(checkpoint_path)
+    pending = frame[~frame["id"].isin(done)]
+    print(f"{len(frame)} profiles, {len(done)} already done, {len(pending)} to run", file=sys.stderr)
+
+    google_api_key, tavily_api_key = load_api_keys()
+    search_cache = open_search_cache()
+    result_cache = open_result_cache()
+    pool = AgentPool(lambda: create_agent(google_api_key, tavily_api_key, search_cache), size=workers)
+    single_flight = SingleFlight()
+    job_index = JobIndex(job_index_path) if job_index_path else None
+    salary_store = SalaryStore.open(salary_store_dir)
+    similar_index = open_similar_index(threshold=similar_threshold)
+    # Score every pending candidate against the role taxonomy in one matrix multiply
+    role_matches = {}
+    if os.path.exists(ROLE_TAXONOMY_PATH) and len(pending):
+        matcher = RoleMatcher.load(ROLE_TAXONOMY_PATH)
+        ranked = matcher.rank_batch([canonicalize_skills(skills) for skills in pending["skills"]])
+        role_matches = dict(zip(pending["id"], ranked))
+    limiter = RateLimiter(rate)
+    write_lock = threading.Lock()
+    # Keep at most a couple of profiles queued per worker instead of submitting the whole file up front
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def process(row):
+        try:
+            limiter.wait()
+            started = time.perf_counter()
+            record = {"id": row["id"], **{field: row[field] for field in PROFILE_FIELDS}}
+            try:
+                record["result"] = analyze_profile(
+                    pool,
+                    result_cache,
+                    *(row[field] for field in PROFILE_FIELDS),
+                    mode=mode,
+                    single_flight=single_flight,
+                    deadline=deadline,
+                    max_tool_calls=max_tool_calls,
+                    job_index=job_index,
+                    role_matches=role_matches.get(row["id"]),
+                    salary_store=salary_store,
+                    similar_index=similar_index,
+                )
+                record["error"] = None
+            except Exception as e:
+                record["result"] = None
+                record["error"] = str(e)
+            record["elapsed"] = round(time.perf_counter() - started, 3)
+            with write_lock, open(checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            status = "error" if record["error"] else "ok"
+            print(f"[{status}] {record['id']} in {record['elapsed']}s", file=sys.stderr)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as executor:
+        for row in pending.to_dict("records"):
+            slots.acquire()
+            executor.submit(process, row)
+
+    if checkpoint_path != output_path:
+        results = pd.read_json(checkpoint_path, lines=True, dtype=False)
+        # Keep the latest attempt per profile when earlier attempts failed
+        results = results.drop_duplicates("id", keep="last")
+        try:
+            results.to_parquet(output_path, index=False)
+        except ImportError as e:
+            raise SystemExit(f"Parquet output needs pyarrow ({e}); results are in {checkpoint_path}")
+    print(f"Results written to {output_path}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a file of candidate profiles without the web UI.")
+    parser.add_argument("input", help="CSV or JSONL file with skills, experience_level, preferred_location, career_goals")
+    parser.add_argument("output", help="Results file (.jsonl, or .parquet with a .partial.jsonl checkpoint)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent analyses (default: 4)")
+    parser.add_argument("--rate", type=float, default=0, help="Maximum analyses started per minute (default: unlimited)")
+    parser.add_argument("--mode", choices=["single", "parallel"], default="single", help="Analysis mode (default: single)")
+    parser.add_argument("--deadline", type=float, help="Seconds per analysis before it is returned as partial")
+    parser.add_argument("--max-searches", type=int, help="Live web searches allowed per analysis")
+    parser.add_argument("--job-index", help="Local job-posting index (see job_index.py) used to ground the analysis")
+    parser.add_argument("--salary-store", default=SALARY_STORE_DIR, help="Local salary store (see salary_store.py)")
+    parser.add_argument(
+        "--similar-threshold",
+        type=float,
+        default=0,
+        help="Reuse cached reports of profiles at least this Jaccard-similar (default: 0, exact matches only)",
+    )
+    args = parser.parse_args(argv)
+    run_batch(
+        args.input,
+        args.output,
+        workers=args.workers,
+        rate=args.rate,
+        mode=args.mode,
+        deadline=args.deadline,
+        max_tool_calls=args.max_searches,
+        job_index_path=args.job_index,
+        salary_store_dir=args.salary_store,
+        similar_threshold=args.similar_threshold,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Offline performance benchmark with local stand-ins for Gemini and Tavily.
+
+The agent pool is filled with FakeAgent objects whose generation time, search
+round trips and response size are drawn from configurable distributions, so
+the analysis pipeline (canonicalization, caches, single-flight, pool, section
+fan-out) can be measured without network access or API quota. Results are
+printed as JSON for regression tracking.
+
+    python benchmark.py --requests 200 --sessions 16 --output bench.json
+    python benchmark.py --startup-only      # import time per module
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from advisor import SECTIONS, analyze_profile
+from agent_pool import AgentPool
+from cache import DiskCache
+from metrics import STAGE_SECONDS, count_tool_call
+from singleflight import SingleFlight
+
+SAMPLE_SKILLS = [
+    "Python", "SQL", "Machine Learning", "JavaScript", "React", "AWS", "Docker", "Kubernetes",
+    "Project Management", "Data Analysis", "Leadership", "Communication", "Java", "Excel",
+    "Tableau", "Go", "TypeScript", "Node.js", "Deep Learning", "UX Design",
+]
+SAMPLE_LOCATIONS = ["New York", "Remote", "San Francisco", "London", "Bangalore", "Berlin", "Toronto"]
+SAMPLE_LEVELS = [
+    "🌱 Entry Level (0-2 years) - Recent graduate or career starter",
+    "🚀 Mid Level (2-5 years) - Developing expertise and taking on more responsibility",
+    "⭐ Senior Level (5-10 years) - Experienced professional with proven track record",
+    "🎯 Expert Level (10+ years) - Industry leader with extensive experience",
+]
+
+# What app.py imports before the first paint, and the heavy stacks that must stay out of that path
+STARTUP_MODULES = [
+    "streamlit", "assets", "cache", "singleflight", "advisor", "agent_pool", "budget", "job_index",
+    "metrics", "pdf_export", "role_matcher", "salary_store", "similar_cache", "skills", "report",
+]
+DEFERRED_MODULES = ["phi.agent", "phi.model.google", "phi.tools.tavily", "tools", "reportlab.platypus", "pandas"]
+
+
+class LatencyModel:
+    """Log-normal latency distribution described by its median and spread."""
+
+    def __init__(self, median, sigma=0.5):
+        self.median = median
+        self.sigma = sigma
+
+    def sample(self, rng):
+        return self.median * rng.lognormvariate(0, self.sigma) if self.median > 0 else 0.0
+
+
+class FakeSearch:
+    """Stand-in for TavilyTools that sleeps for a sampled search latency."""
+
+    def __init__(self, latency, rng):
+        self.latency = latency
+        self.rng = rng
+        self.calls = 0
+
+    def search(self, query):
+        self.calls += 1
+        count_tool_call("fake_search", False)
+        time.sleep(self.latency.sample(self.rng))
+        return f"results for {query}"
+
+
+class _FakeMemory:
+    def clear(self):
+        pass
+
+
+class _FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeAgent:
+    """Stand-in for the phi Agent with the same run()/stream interface."""
+
+    def __init__(self, generation, search, tool_calls=3, payload_chars=6000, chunk_chars=200, seed=None):
+        self.rng = random.Random(seed)
+        self.generation = generation
+        self.search = FakeSearch(search, self.rng)
+        self.tool_calls = tool_calls
+        self.payload_chars = payload_chars
+        self.chunk_chars = chunk_chars
+        self.instructions = None
+        self.memory = _FakeMemory()
+
+    def _payload(self):
+        size = max(len(SECTIONS) * 40, int(self.rng.gauss(self.payload_chars, self.payload_chars * 0.2)))
+        body = "x" * (size // len(SECTIONS))
+        return "\n".join(f"{section['marker']} {body}" for section in SECTIONS)
+
+    def _stream(self, content, duration):
+        chunks = [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+        for chunk in chunks:
+            time.sleep(duration / len(chunks))
+            yield _FakeResponse(chunk)
+
+    def run(self, query, stream=False):
+        for _ in range(self.tool_calls):
+            self.search.search(query)
+        content = self._payload()
+        duration = self.generation.sample(self.rng)
+        if stream:
+            return self._stream(content, duration)
+        time.sleep(duration)
+        return _FakeResponse(content)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def random_profile(rng, unique_id=None):
+    skills = ", ".join(rng.sample(SAMPLE_SKILLS, rng.randint(3, 8)))
+    goals = f"Grow into a senior role #{unique_id}" if unique_id is not None else "Grow into a senior role"
+    return skills, rng.choice(SAMPLE_LEVELS), rng.choice(SAMPLE_LOCATIONS), goals
+
+
+class Bench:
+    def __init__(self, args, workdir):
+        self.args = args
+        self.workdir = workdir
+        self.rng = random.Random(args.seed)
+
+    def make_pool(self, size):
+        generation = LatencyModel(self.args.gen_latency, self.args.gen_sigma)
+        search = LatencyModel(self.args.search_latency, self.args.search_sigma)
+        return AgentPool(
+            lambda: FakeAgent(
+                generation,
+                search,
+                tool_calls=self.args.tool_calls,
+                payload_chars=self.args.payload_chars,
+                seed=self.rng.random(),
+            ),
+            size=size,
+        )
+
+    def run_options(self):
+        options = {"mode": self.args.mode}
+        if self.args.stream:
+            options.update(stream=True, on_progress=lambda text: None)
+        return options
+
+    def make_cache(self, name):
+        return DiskCache(os.path.join(self.workdir, f"{name}.sqlite3"), ttl=3600)
+
+    def latency(self):
+        """Sequential cold-cache analyses: end-to-end latency distribution."""
+        pool = self.make_pool(4)
+        cache = self.make_cache("latency")
+        samples = []
+        for i in range(self.args.requests):
+            profile = random_profile(self.rng, unique_id=i)
+            started = time.perf_counter()
+            analyze_profile(pool, cache, *profile, **self.run_options())
+            samples.append(time.perf_counter() - started)
+        return percentiles(samples)
+
+    def concurrency(self):
+        """N concurrent sessions drawing from a skewed profile mix."""
+        sessions = self.args.sessions
+        pool = self.make_pool(self.args.pool_size)
+        cache = self.make_cache("concurrency")
+        single_flight = SingleFlight()
+        # A small set of popular profiles plus a long tail, like production traffic
+        popular = [random_profile(self.rng, unique_id=f"popular-{i}") for i in range(max(1, sessions // 2))]
+        lock = threading.Lock()
+        samples = []
+
+        def session(index):
+            rng = random.Random(self.args.seed + index)
+            for i in range(self.args.requests_per_session):
+                if rng.random() < self.args.repeat_ratio:
+                    profile = rng.choice(popular)
+                else:
+                    profile = random_profile(rng, unique_id=f"{index}-{i}")
+                started = time.perf_counter()
+                analyze_profile(pool, cache, *profile, single_flight=single_flight, **self.run_options())
+                with lock:
+                    samples.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            list(executor.map(session, range(sessions)))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            "sessions": sessions,
+            "requests": len(samples),
+            "elapsed_s": elapsed,
+            "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+            "latency_s": percentiles(samples),
+            "cache": cache.stats(),
+            "peak_traced_bytes": peak,
+            "memory_per_session_bytes": peak / sessions,
+        }
+
+    def _import_ms(self, statement, module):
+        """Cumulative import time of module in a fresh interpreter, best of --import-repeat runs."""
+        best = None
+        for _ in range(self.args.import_repeat):
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", statement],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                return {"error": proc.stderr.strip().splitlines()[-1]}
+            for line in proc.stderr.splitlines():
+                parts = line.split("|")
+                if len(parts) == 3 and parts[2].strip() == module:
+                    cumulative = int(parts[1]) / 1000
+                    best = cumulative if best is None else min(best, cumulative)
+        return best
+
+    def startup(self):
+        """Per-module import time (-X importtime) and which heavy stacks load before the first paint."""
+        modules = {name: self._import_ms(f"import {name}", name) for name in STARTUP_MODULES + DEFERRED_MODULES}
+        probe = (
+            "import json, sys, time; started = time.perf_counter(); "
+            + "; ".join(f"import {name}" for name in STARTUP_MODULES if name != "streamlit")
+            + "; print(json.dumps({'seconds': time.perf_counter() - started, "
+            + f"'loaded': [name for name in {DEFERRED_MODULES!r} if name in sys.modules]}}))"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", probe], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True
+        )
+        app_modules = json.loads(proc.stdout) if proc.returncode == 0 else {"error": proc.stderr.strip().splitlines()[-1]}
+        return {"import_ms": modules, "app_modules": app_modules}
+
+    def render(self):
+        """Time app.py reruns with Streamlit's headless test runner, full script vs results fragment.
+
+        Rerun counts come from career_stage_seconds{stage="rerun"}, so they show
+        how many full-script runs each interaction actually caused.
+        """
+        try:
+            from streamlit.testing.v1 import AppTest
+        except ImportError:
+            return {"skipped": "streamlit.testing is not available"}
+        app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+        app = AppTest.from_file(app_path, default_timeout=60)
+        app.secrets["GOOGLE_API_KEY"] = "benchmark"
+        app.secrets["TAVILY_API_KEY"] = "benchmark"
+
+        def reruns():
+            return {scope: STAGE_SECONDS.totals(stage="rerun", scope=scope)[0] for scope in ("app", "results")}
+
+        samples = []
+        for _ in range(self.args.reruns):
+            started = time.perf_counter()
+            app.run()
+            samples.append(time.perf_counter() - started)
+        if app.exception:
+            return {"error": str(app.exception[0].message)}
+        results = {"first_run_s": samples[0], "rerun_s": percentiles(samples[1:])}
+
+        # With a report on screen, a result button should re-run only the results fragment
+        payload = "\n".join(f"{section['marker']} {'x' * (self.args.payload_chars // len(SECTIONS))}" for section in SECTIONS)
+        app.session_state["analysis_results"] = payload
+        app.run()
+        before = reruns()
+        clicks = []
+        for _ in range(self.args.reruns):
+            started = time.perf_counter()
+            app.button(key="share_btn").click().run()
+            clicks.append(time.perf_counter() - started)
+        if app.exception:
+            results["fragment_error"] = str(app.exception[0].message)
+        results["result_click_s"] = percentiles(clicks)
+        results["result_click_reruns"] = {scope: reruns()[scope] - before[scope] for scope in before}
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline with local model/search stand-ins.")
+    parser.add_argument("--requests", type=int, default=50, help="Sequential cold-cache analyses for latency percentiles")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions for the throughput run")
+    parser.add_argument("--requests-per-session", type=int, default=10)
+    parser.add_argument("--repeat-ratio", type=float, default=0.5, help="Share of requests that reuse a popular profile")
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--mode", choices=["single", "parallel"], default="single")
+    parser.add_argument("--stream", action="store_true", help="Consume responses as token streams")
+    parser.add_argument("--gen-latency", type=float, default=0.5, help="Median model generation time in seconds")
+    parser.add_argument("--gen-sigma", type=float, default=0.4)
+    parser.add_argument("--search-latency", type=float, default=0.1, help="Median search round trip in seconds")
+    parser.add_argument("--search-sigma", type=float, default=0.5)
+    parser.add_argument("--tool-calls", type=int, default=3, help="Search calls per agent run")
+    parser.add_argument("--payload-chars", type=int, default=6000, help="Mean response size in characters")
+    parser.add_argument("--reruns", type=int, default=5, help="Streamlit reruns for render timing (0 to skip)")
+    parser.add_argument("--import-repeat", type=int, default=3, help="Fresh interpreters per module for import timing")
+    parser.add_argument("--startup-only", action="store_true", help="Only measure module import times")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="career-bench-") as workdir:
+        bench = Bench(args, workdir)
+        if args.startup_only:
+            results = {"timestamp": time.time(), "python": platform.python_version(), "startup": bench.startup()}
+        else:
+            results = {
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "config": vars(args),
+                "startup": bench.startup(),
+                "latency_s": bench.latency(),
+                "concurrency": bench.concurrency(),
+                "render": bench.render() if args.reruns else {"skipped": "--reruns 0"},
+            }
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import threading
+import time
+from contextlib import contextmanager
+
+PARTIAL_NOTICE = "⚠️ *Partial report:* the analysis hit its time or search budget, so some sections may be incomplete."
+TOOL_REFUSAL = (
+    "Search budget for this analysis is exhausted. Do not call any more tools; "
+    "write the complete report now using only the information gathered so far."
+)
+
+_current = threading.local()
+
+
+class Budget:
+    """Deadline and live-search allowance shared by every agent run of one analysis.
+
+    Once the deadline passes or max_tool_calls live searches have been made,
+    further tool calls are refused with TOOL_REFUSAL so the model answers with
+    what it has. Streaming output is cut off grace seconds after the deadline,
+    or immediately once cancel() is called.
+    """
+
+    def __init__(self, deadline=None, max_tool_calls=None, grace=20):
+        self.started = time.monotonic()
+        self.deadline = deadline
+        self.max_tool_calls = max_tool_calls
+        self.grace = grace
+        self.tool_calls = 0
+        self.exhausted = False
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        """Seconds left before the deadline, or None without one."""
+        return None if self.deadline is None else max(self.deadline - self.elapsed(), 0.0)
+
+    def past_deadline(self, grace=0):
+        return self.deadline is not None and self.elapsed() > self.deadline + grace
+
+    def allow_tool_call(self):
+        """Reserve one live search, or mark the analysis partial if none are left."""
+        with self._lock:
+            over_calls = self.max_tool_calls is not None and self.tool_calls >= self.max_tool_calls
+            if over_calls or self.cancelled or self.past_deadline():
+                self.exhausted = True
+                return False
+            self.tool_calls += 1
+            return True
+
+    def cut_off(self):
+        """True once streaming output should stop and the report be returned as is."""
+        if self.cancelled or self.past_deadline(self.grace):
+            self.exhausted = True
+            return True
+        return False
+
+    def cancel(self):
+        """Abort the analysis: refuse further searches and stop every stream at its next chunk."""
+        self.cancelled = True
+        self.exhausted = True
+
+    @contextmanager
+    def active(self):
+        """Make this the budget for tool calls on the current thread."""
+        previous = getattr(_current, "budget", None)
+        _current.budget = self
+        try:
+            yield self
+        finally:
+            _current.budget = previous
+
+
+class SharedBudget(Budget):
+    """Budget of one run whose result several coalesced callers wait for.
+
+    It counts as cancelled only once every joined caller's own budget is
+    cancelled, so one caller leaving does not cut the report short for the
+    others. Live searches are mirrored into the callers' budgets for their
+    progress displays.
+    """
+
+    def __init__(self, deadline=None, max_tool_calls=None, grace=20):
+        self._callers = []
+        self._cancelled = False
+        super().__init__(deadline, max_tool_calls, grace)
+
+    @property
+    def cancelled(self):
+        return self._cancelled or (bool(self._callers) and all(caller.cancelled for caller in self._callers))
+
+    @cancelled.setter
+    def cancelled(self, value):
+        self._cancelled = value
+
+    def join(self, caller):
+        """Add a waiting caller's budget; False if the run is already cancelled and cannot be shared."""
+        with self._lock:
+            if self.cancelled:
+                return False
+            caller.tool_calls = self.tool_calls
+            self._callers.append(caller)
+            return True
+
+    def allow_tool_call(self):
+        allowed = super().allow_tool_call()
+        if allowed:
+            for caller in list(self._callers):
+                caller.tool_calls += 1
+        return allowed
+
+
+def current_budget():
+    return getattr(_current, "budget", None)
+
+
+def is_partial(report):
+    return bool(report) and report.startswith(PARTIAL_NOTICE)
@@ -0,0 +1,245 @@
+"""Local full-text index of job postings used to ground the analysis.
+
+Postings from offline CSV/JSONL exports are ingested into an SQLite FTS5
+inverted index over title, skills, location and company, kept in step with
+the postings table by triggers. Re-ingesting a posting with the same id
+replaces it, so dumps can be loaded incrementally.
+
+    python job_index.py ingest exports/postings-2025-06.csv exports/more.jsonl
+    python job_index.py search "Python, SQL, Airflow" --location London
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from cache import DEFAULT_CACHE_DIR, fingerprint
+from locations import parse_locations
+from salary_store import normalize_location
+from skills import canonicalize_skills
+
+DEFAULT_INDEX_PATH = os.environ.get("JOB_INDEX_PATH", os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3"))
+
+# Accepted column names in export files, first match wins
+FIELD_ALIASES = {
+    "id": ["id", "job_id", "posting_id"],
+    "title": ["title", "job_title", "position"],
+    "company": ["company", "company_name", "employer"],
+    "location": ["location", "job_location", "city"],
+    "skills": ["skills", "required_skills", "tags"],
+    "description": ["description", "job_description", "summary"],
+    "url": ["url", "job_url", "link"],
+    "posted_at": ["posted_at", "date_posted", "created_at"],
+}
+# bm25 column weights: title, skills, location, company
+BM25_WEIGHTS = (3.0, 2.0, 0.5, 1.0)
+LOCATION_BONUS = 2.0
+
+
+def _pick(record, field):
+    for name in FIELD_ALIASES[field]:
+        value = record.get(name)
+        if value not in (None, ""):
+            if isinstance(value, (list, tuple)):
+                return ", ".join(str(item) for item in value)
+            return str(value)
+    return ""
+
+
+def _read_records(path):
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+def _fts_terms(values):
+    """Quote each term for an FTS5 MATCH expression."""
+    terms = []
+    for value in values:
+        cleaned = value.replace('"', " ").strip()
+        if cleaned:
+            terms.append(f'"{cleaned}"')
+    return terms
+
+
+class JobIndex:
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                rowid INTEGER PRIMARY KEY,
+                posting_id TEXT NOT NULL UNIQUE,
+                title TEXT, skills TEXT, location TEXT, company TEXT,
+                description TEXT, url TEXT, posted_at TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                title, skills, location, company,
+                content = 'jobs', content_rowid = 'rowid',
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            -- Keep the inverted index in step with the postings table
+            CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts (rowid, title, skills, location, company)
+                VALUES (new.rowid, new.title, new.skills, new.location, new.company);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, skills, location, company)
+                VALUES ('delete', old.rowid, old.title, old.skills, old.location, old.company);
+            END;
+            """
+        )
+        self._conn.commit()
+
+    def ingest(self, records):
+        """Insert or replace postings; returns the number of postings written."""
+        count = 0
+        with self._lock:
+            for record in records:
+                posting = {field: _pick(record, field) for field in FIELD_ALIASES}
+                if not posting["title"]:
+                    continue
+                if not posting["id"]:
+                    posting["id"] = fingerprint(posting["title"], posting["company"], posting["location"])
+                posting["skills"] = ", ".join(canonicalize_skills(posting["skills"]))
+                # Delete then insert so the delete trigger removes the old terms from the index
+                self._conn.execute("DELETE FROM jobs WHERE posting_id = ?", (posting["id"],))
+                self._conn.execute(
+                    "INSERT INTO jobs (posting_id, title, skills, location, company, description, url, posted_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        posting["id"], posting["title"], posting["skills"], posting["location"],
+                        posting["company"], posting["description"], posting["url"], posting["posted_at"],
+                    ),
+                )
+                count += 1
+            self._conn.commit()
+        return count
+
+    def ingest_files(self, paths):
+        return sum(self.ingest(_read_records(path)) for path in paths)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def search(self, skills, location="", k=10, candidates=200):
+        """Top-k postings for a skill list, ranked by bm25 with a bonus for the preferred location."""
+        terms = _fts_terms(skills)
+        if not terms:
+            return []
+        match = "{title skills} : (" + " OR ".join(terms) + ")"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT jobs.posting_id, jobs.title, jobs.company, jobs.location, jobs.skills, jobs.url, "
+                "jobs.posted_at, bm25(jobs_fts, ?, ?, ?, ?) AS rank "
+                "FROM jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid "
+                "WHERE jobs_fts MATCH ? ORDER BY rank LIMIT ?",
+                (*BM25_WEIGHTS, match, candidates),
+            ).fetchall()
+        in_location = _location_matcher(location)
+        results = []
+        for posting_id, title, company, posting_location, posting_skills, url, posted_at, rank in rows:
+            # bm25() is lower-is-better, so flip it into a score
+            score = -rank
+            if in_location is not None and in_location(posting_location):
+                score += LOCATION_BONUS
+            results.append({
+                "id": posting_id,
+                "title": title,
+                "company": company,
+                "location": posting_location,
+                "skills": posting_skills,
+                "url": url,
+                "posted_at": posted_at,
+                "score": round(score, 4),
+            })
+        results.sort(key=lambda posting: posting["score"], reverse=True)
+        return results[:k]
+
+
+def _words(text):
+    return tuple(re.findall(r"\w+", str(text or "").lower()))
+
+
+def _location_matcher(location):
+    """Predicate for posting locations that name one of the places in a preferred location.
+
+    Each place matches on the whole words of its city, so "New York, NY"
+    matches "New York" but not "Albany, NY" or "Sunnyvale", and
+    abbreviations are expanded on both sides with
+    salary_store.normalize_location(), so "NYC" matches "New York".
+    """
+    wanted = set()
+    for place in parse_locations(location):
+        wanted.update({_words(place.split(",")[0]), _words(normalize_location(place))})
+    wanted.discard(())
+    if not wanted:
+        return None
+
+    def matches(posting_location):
+        words, city = _words(posting_location), _words(normalize_location(posting_location))
+        return any(
+            place == city or any(words[start:start + len(place)] == place for start in range(len(words)))
+            for place in wanted
+        )
+
+    return matches
+
+
+def format_postings(postings):
+    """Compact bullet list of postings for the agent prompt."""
+    lines = []
+    for posting in postings:
+        details = ", ".join(part for part in (posting["company"], posting["location"]) if part)
+        line = f"- {posting['title']}" + (f" ({details})" if details else "")
+        if posting["skills"]:
+            line += f"; skills: {posting['skills']}"
+        if posting["url"]:
+            line += f"; {posting['url']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain and query the local job-posting index.")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Index database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Add or update postings from CSV/JSONL exports")
+    ingest.add_argument("files", nargs="+")
+    search = commands.add_parser("search", help="Show the top postings for a skill list")
+    search.add_argument("skills")
+    search.add_argument("--location", default="")
+    search.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    index = JobIndex(args.index)
+    if args.command == "ingest":
+        started = time.perf_counter()
+        written = index.ingest_files(args.files)
+        print(f"Ingested {written} postings in {time.perf_counter() - started:.2f}s ({index.count()} total)", file=sys.stderr)
+    else:
+        started = time.perf_counter()
+        postings = index.search(canonicalize_skills(args.skills), args.location, k=args.k)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for posting in postings:
+            print(json.dumps(posting, ensure_ascii=False))
+        print(f"{len(postings)} postings in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
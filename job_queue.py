@@ -0,0 +1,202 @@
+"""Durable SQLite job queue between the web UI and separate worker processes.
+
+In queue mode the app only enqueues profiles and polls their rows; worker.py
+processes on this host (or on other hosts sharing the store over a file system
+with working locks) claim jobs, run the analysis and write progress and
+results back. A job whose worker stops heartbeating is handed to another
+worker, up to max_attempts times.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from cache import DEFAULT_CACHE_DIR
+
+DEFAULT_QUEUE_PATH = os.environ.get("JOB_QUEUE_PATH", os.path.join(DEFAULT_CACHE_DIR, "queue.sqlite3"))
+FINISHED = ("done", "failed", "cancelled")
+
+
+class QueuedJob:
+    """Read-only view of one queue row with the same interface as jobs.Job."""
+
+    def __init__(self, queue, row):
+        self._queue = queue
+        self.id = row["id"]
+        self.status = row["status"]
+        self.result = row["result"]
+        self.error = row["error"]
+        self.text = row["text"] or ""
+        self.tool_calls = row["tool_calls"]
+        self.started_at = row["started_at"]
+        self.finished_at = row["finished_at"]
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def wait(self, timeout=None, interval=0.05):
+        """Poll until the job finishes or timeout passes; True if it finished."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.finished:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+            job = self._queue.get(self.id)
+            if job is None:
+                # Purged after keep_for; there is no outcome left to wait for
+                return False
+            self.__dict__.update(job.__dict__)
+        return True
+
+    def progress(self):
+        """Snapshot for the UI; reading it also tells workers the job is still watched."""
+        self._queue.touch(self.id)
+        return {
+            "status": self.status,
+            "tool_calls": self.tool_calls,
+            "elapsed": time.time() - self.started_at if self.started_at else 0.0,
+            "text": self.text,
+        }
+
+
+class JobQueue:
+    def __init__(self, path=DEFAULT_QUEUE_PATH, lease=60, max_attempts=3, keep_for=3600):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.keep_for = keep_for
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                text TEXT,
+                tool_calls INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                heartbeat_at REAL,
+                polled_at REAL NOT NULL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+            """
+        )
+
+    def enqueue(self, payload):
+        """Add a job for the workers and return its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at, polled_at) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, json.dumps(payload), now, now),
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return QueuedJob(self, row) if row is not None else None
+
+    def touch(self, job_id):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET polled_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def cancel(self, job_id):
+        """Cancel a queued job outright, or ask the worker running it to stop."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'", (now, job_id)
+            )
+            self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+
+    def claim(self, worker, abandon_after=None):
+        """Atomically take the oldest runnable job; returns (id, payload) or None.
+
+        Jobs whose worker missed its heartbeat lease are retried first. Queued
+        jobs nobody has polled for abandon_after seconds are cancelled instead
+        of started.
+        """
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers can never claim the same row
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                    "WHERE status = 'running' AND heartbeat_at < ? AND cancel_requested = 1",
+                    (now, now - self.lease),
+                )
+                self._conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                    "error = CASE WHEN attempts >= ? THEN 'worker stopped responding' ELSE error END, "
+                    "finished_at = CASE WHEN attempts >= ? THEN ? ELSE NULL END "
+                    "WHERE status = 'running' AND heartbeat_at < ?",
+                    (self.max_attempts, self.max_attempts, self.max_attempts, now, now - self.lease),
+                )
+                if abandon_after is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE status = 'queued' AND polled_at < ?",
+                        (now, now - abandon_after),
+                    )
+                row = self._conn.execute(
+                    "SELECT id, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                        "started_at = ?, heartbeat_at = ? WHERE id = ?",
+                        (worker, now, now, row["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (row["id"], json.loads(row["payload"])) if row is not None else None
+
+    def heartbeat(self, job_id, worker, text, tool_calls, abandon_after=None):
+        """Record progress and renew the lease; True if the job should stop (cancelled, abandoned or taken over)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET text = ?, tool_calls = ?, heartbeat_at = ? WHERE id = ? AND worker = ?",
+                (text, tool_calls, now, job_id, worker),
+            )
+            row = self._conn.execute(
+                "SELECT worker, cancel_requested, polled_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None or row["worker"] != worker:
+            return True
+        return bool(row["cancel_requested"]) or (abandon_after is not None and now - row["polled_at"] > abandon_after)
+
+    def finish(self, job_id, worker, status, result=None, error=None):
+        """Record the outcome; ignored (False) once the job's lease has passed to another worker."""
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, heartbeat_at = ? "
+                "WHERE id = ? AND worker = ?",
+                (status, result, error, now, now, job_id, worker),
+            ).rowcount
+            self._conn.execute("DELETE FROM jobs WHERE finished_at < ?", (now - self.keep_for,))
+        return bool(updated)
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
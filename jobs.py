@@ -0,0 +1,126 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from budget import Budget
+from metrics import log_event
+
+
+class Job:
+    """One background analysis: its status, live progress and result.
+
+    status moves from "queued" to "running" and ends as "done", "failed" or
+    "cancelled". text holds the report as streamed so far.
+    """
+
+    def __init__(self, budget):
+        self.id = uuid.uuid4().hex
+        self.budget = budget
+        self.status = "queued"
+        self.text = ""
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.polled_at = time.monotonic()
+        self._done = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def wait(self, timeout=None):
+        """Block until the job finishes or timeout passes; True if it finished."""
+        return self._done.wait(timeout)
+
+    def progress(self):
+        """Snapshot for the UI; reading it also marks the job as still watched."""
+        self.polled_at = time.monotonic()
+        return {
+            "status": self.status,
+            "tool_calls": self.budget.tool_calls,
+            "elapsed": self.budget.elapsed(),
+            "text": self.text,
+        }
+
+
+class JobManager:
+    """Runs analyses on a worker pool so Streamlit script threads never block on them.
+
+    Sessions keep only the job id and poll progress(). A job nobody has polled
+    for abandon_after seconds is cancelled, so a closed tab stops spending
+    model and search quota; finished jobs are forgotten after keep_for seconds.
+    """
+
+    def __init__(self, max_workers=8, abandon_after=60, keep_for=600):
+        self.abandon_after = abandon_after
+        self.keep_for = keep_for
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._reap_forever, name="analysis-job-reaper", daemon=True).start()
+
+    def submit(self, fn, deadline=None, max_tool_calls=None):
+        """Start fn(job) in the background and return the job id.
+
+        fn runs the analysis with job.budget and may update job.text as the
+        report streams in; its return value becomes job.result.
+        """
+        job = Job(Budget(deadline, max_tool_calls))
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn)
+        return job.id
+
+    def _run(self, job, fn):
+        if job.budget.cancelled:
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            job._done.set()
+            return
+        # The deadline counts from when the job starts, not from when it was queued
+        job.budget.started = time.monotonic()
+        job.status = "running"
+        try:
+            job.result = fn(job)
+            job.status = "cancelled" if job.budget.cancelled else "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = time.time()
+        job._done.set()
+        log_event("job", status=job.status, seconds=round(job.finished_at - job.created_at, 3))
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Abort a job; in-flight model streams stop at their next chunk and searches are refused."""
+        job = self.get(job_id)
+        if job is not None and not job.finished:
+            job.budget.cancel()
+        return job
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in set(statuses)}
+
+    def reap(self):
+        """Cancel abandoned jobs and drop finished ones past their retention."""
+        now, wall = time.monotonic(), time.time()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not job.finished and now - job.polled_at > self.abandon_after:
+                job.budget.cancel()
+            elif job.finished and wall - job.finished_at > self.keep_for:
+                with self._lock:
+                    self._jobs.pop(job.id, None)
+
+    def _reap_forever(self, interval=10):
+        while True:
+            time.sleep(interval)
+            self.reap()
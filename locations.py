@@ -0,0 +1,91 @@
+import os
+import re
+
+# Most places one analysis fans out to; further ones in the input are ignored
+MAX_LOCATIONS = int(os.environ.get("MAX_LOCATIONS", 5))
+
+# Separators between places (lowercase "or" only, so "Portland, OR" survives); commas are handled
+# on their own since "Austin, TX" is one place
+_SEPARATORS = re.compile(r"[;\n\r\t|/•&]+|\b(?:and|or)\b")
+_COMMA = re.compile(",")
+# A comma-separated part that qualifies the place before it instead of naming a new one: a state
+# or country code, or a country, state or region name after a place that is not itself one of those.
+# City-states (Singapore, Hong Kong, Luxembourg) are left out since they name places of their own.
+_QUALIFIER = re.compile(r"^(?:[A-Z]{2}|USA|UAE)$")
+_REGIONS = frozenset(
+    name.strip()
+    for name in """
+argentina, australia, austria, bangladesh, belgium, brazil, bulgaria, canada, chile, china, colombia,
+croatia, cyprus, czech republic, czechia, denmark, egypt, estonia, finland, france, germany, ghana, greece,
+hungary, iceland, india, indonesia, ireland, israel, italy, japan, jordan, kenya, latvia,
+lithuania, malaysia, malta, mexico, morocco, netherlands, the netherlands, new zealand, nigeria,
+norway, pakistan, peru, philippines, poland, portugal, qatar, romania, russia, saudi arabia, serbia,
+slovakia, slovenia, south africa, south korea, korea, spain, sri lanka, sweden, switzerland,
+taiwan, thailand, turkey, ukraine, united arab emirates, united kingdom, united states,
+united states of america, us, uk, england, scotland, wales, northern ireland, vietnam,
+alabama, alaska, arizona, arkansas, california, colorado, connecticut, delaware, florida, georgia, hawaii,
+idaho, illinois, indiana, iowa, kansas, kentucky, louisiana, maine, maryland, massachusetts, michigan,
+minnesota, mississippi, missouri, montana, nebraska, nevada, new hampshire, new jersey, new mexico,
+north carolina, north dakota, ohio, oklahoma, oregon, pennsylvania, rhode island, south carolina,
+south dakota, tennessee, texas, utah, vermont, virginia, west virginia, wisconsin, wyoming,
+alberta, british columbia, manitoba, ontario, quebec, nova scotia,
+karnataka, maharashtra, tamil nadu, telangana, kerala, haryana, bavaria,
+europe, eu, emea, apac, latam, north america, asia
+""".split(",")
+)
+
+
+def _split_top_level(text, separator):
+    # Separators inside parentheses belong to one place, as in "Hybrid (Berlin, Munich)"
+    parts, depth, start, scanned = [], 0, 0, 0
+    for match in separator.finditer(text):
+        for char in text[scanned:match.start()]:
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth = max(depth - 1, 0)
+        scanned = match.start()
+        if depth == 0:
+            parts.append(text[start:match.start()])
+            start = match.end()
+    parts.append(text[start:])
+    return parts
+
+
+def parse_locations(text, limit=MAX_LOCATIONS):
+    """Distinct places named in a free-text preferred location, in input order, at most limit.
+
+    >>> parse_locations("New York, Remote, London")
+    ['New York', 'Remote', 'London']
+    >>> parse_locations("Austin, TX or Bangalore, India; Paris, France, Remote")
+    ['Austin, TX', 'Bangalore, India', 'Paris, France', 'Remote']
+    >>> parse_locations("Toronto, Ontario, Canada")
+    ['Toronto, Ontario, Canada']
+    >>> parse_locations("New York, Singapore, London")
+    ['New York', 'Singapore', 'London']
+    >>> parse_locations("Germany, France, Spain")
+    ['Germany', 'France', 'Spain']
+    >>> parse_locations("Dubai, UAE, Singapore")
+    ['Dubai, UAE', 'Singapore']
+    >>> parse_locations("London, Luxembourg")
+    ['London', 'Luxembourg']
+    >>> parse_locations("Hybrid (Berlin, Munich) / Hybrid (Berlin/Munich)")
+    ['Hybrid (Berlin, Munich)', 'Hybrid (Berlin/Munich)']
+    """
+    places = {}
+    for chunk in _split_top_level(text or "", _SEPARATORS):
+        parts = []
+        for raw in _split_top_level(chunk, _COMMA):
+            part = " ".join(raw.strip(" .-*\"'").split())
+            if not part:
+                continue
+            if parts and (
+                _QUALIFIER.match(part)
+                or (part.lower() in _REGIONS and parts[-1].split(",")[0].lower() not in _REGIONS)
+            ):
+                parts[-1] = f"{parts[-1]}, {part}"
+            else:
+                parts.append(part)
+        for part in parts:
+            places.setdefault(part.lower(), part)
+    return list(places.values())[:limit]
@@ -0,0 +1,215 @@
+"""Hot-path timings and counters in Prometheus text format plus a JSONL event log.
+
+Everything is process-local and dependency-free: metrics are kept in memory,
+served on /metrics by start_metrics_server(), and every observation is also
+appended to a size-rotated JSONL file for offline analysis.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+from cache import DEFAULT_CACHE_DIR
+
+EVENT_LOG_PATH = os.environ.get("METRICS_LOG_PATH", os.path.join(DEFAULT_CACHE_DIR, "metrics", "events.jsonl"))
+EVENT_LOG_MAX_BYTES = int(os.environ.get("METRICS_LOG_MAX_BYTES", 10 * 1024 * 1024))
+EVENT_LOG_BACKUPS = int(os.environ.get("METRICS_LOG_BACKUPS", 5))
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, float("inf"))
+
+_event_logger = None
+_event_lock = threading.Lock()
+# Per-thread stats of the agent run in progress; phi executes tool calls on the calling thread
+_run_state = threading.local()
+
+
+def _labels_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    escaped = (f'{name}="{value}"'.replace("\n", " ") for name, value in items)
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def totals(self, **labels):
+        """(count, sum) of the observations recorded for one label set."""
+        with self._lock:
+            series = self._series.get(_labels_key(labels))
+            return (series["count"], series["sum"]) if series else (0, 0.0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["counts"]):
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', le)])} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("career_stage_seconds", "Wall-clock time per pipeline stage.")
+TOOL_CALLS = Counter("career_tool_calls_total", "Search tool invocations by tool and cache outcome.")
+TOKENS = Counter("career_tokens_total", "Model tokens by direction.")
+CACHE_LOOKUPS = Counter("career_cache_lookups_total", "Cache lookups by cache and outcome.")
+ANALYSES = Counter("career_analyses_total", "Completed analyses by mode and status.")
+RUN_TOOL_CALLS = Histogram(
+    "career_run_tool_calls", "Tool-call round trips per agent run.", buckets=(0, 1, 2, 3, 5, 8, 13, 21, float("inf"))
+)
+
+REGISTRY = [STAGE_SECONDS, TOOL_CALLS, TOKENS, CACHE_LOOKUPS, ANALYSES, RUN_TOOL_CALLS]
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _get_event_logger():
+    global _event_logger
+    with _event_lock:
+        if _event_logger is None:
+            os.makedirs(os.path.dirname(EVENT_LOG_PATH), exist_ok=True)
+            logger = logging.getLogger("career.metrics")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = RotatingFileHandler(EVENT_LOG_PATH, maxBytes=EVENT_LOG_MAX_BYTES, backupCount=EVENT_LOG_BACKUPS)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _event_logger = logger
+    return _event_logger
+
+
+def log_event(event, **fields):
+    """Append one JSON line to the rotating event log."""
+    record = {"ts": time.time(), "event": event, **fields}
+    try:
+        _get_event_logger().info(json.dumps(record, default=str, ensure_ascii=False))
+    except OSError:
+        # Metrics must never break an analysis; a read-only disk just loses the log line
+        pass
+
+
+@contextmanager
+def timed(stage, **labels):
+    """Time a block into career_stage_seconds and the event log."""
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage, **labels)
+        log_event("stage", stage=stage, seconds=round(elapsed, 6), status=status, **labels)
+
+
+@contextmanager
+def track_run():
+    """Collect per-run counters (currently tool calls) for the current thread."""
+    stats = {"tool_calls": 0}
+    _run_state.stats = stats
+    try:
+        yield stats
+    finally:
+        _run_state.stats = None
+
+
+def count_tool_call(tool, cached):
+    TOOL_CALLS.inc(tool=tool, cached=str(bool(cached)).lower())
+    stats = getattr(_run_state, "stats", None)
+    if stats is not None:
+        stats["tool_calls"] += 1
+
+
+def record_run(agent, tool_calls, **labels):
+    """Record token usage and tool round trips of the agent's last run."""
+    run_metrics = getattr(getattr(agent, "run_response", None), "metrics", None) or {}
+    tokens = {}
+    for direction in ("input_tokens", "output_tokens"):
+        value = run_metrics.get(direction) or 0
+        # phi reports one entry per model call within the run
+        tokens[direction] = sum(value) if isinstance(value, (list, tuple)) else value
+        if tokens[direction]:
+            TOKENS.inc(tokens[direction], direction=direction.split("_")[0])
+    RUN_TOOL_CALLS.observe(tool_calls, **labels)
+    log_event("run", tool_calls=tool_calls, **tokens, **labels)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread; returns None if the port is taken."""
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError:
+        # Another replica on this host already serves metrics on the port
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,154 @@
+import html
+import io
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from report import SECTION_SPECS, parse_report
+
+# reportlab is imported inside the render functions: they run on the exporter's
+# worker threads, so the app never pays for the import before its first paint
+ACCENT = "#8B7355"
+TEXT = "#2C2416"
+MARGIN = 18  # mm
+
+_TITLE_BY_KEY = {key: title for key, title, _ in SECTION_SPECS}
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_TABLE_ROW = re.compile(r"^\s*\|.*\|\s*$")
+_TABLE_RULE = re.compile(r"^[\s|:-]+$")
+
+
+def _styles():
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    sheet = getSampleStyleSheet()
+    accent, text = HexColor(ACCENT), HexColor(TEXT)
+    return {
+        "title": ParagraphStyle("ReportTitle", parent=sheet["Title"], textColor=accent),
+        "heading": ParagraphStyle("SectionHeading", parent=sheet["Heading2"], textColor=accent, spaceBefore=12),
+        "body": ParagraphStyle("Body", parent=sheet["BodyText"], textColor=text, leading=14),
+    }
+
+
+def _inline(text):
+    """Escape text for reportlab's mini-markup and keep markdown bold/italics."""
+    text = html.escape(text.strip(), quote=False)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    text = re.sub(r"(?<!\*)\*(?!\s)(.+?)(?<!\s)\*(?!\*)", r"<i>\1</i>", text)
+    return re.sub(r"^#{1,6}\s*", "", text)
+
+
+def _table_cells(line):
+    return [cell.replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", line.strip()[1:-1])]
+
+
+def _markdown_flowables(body, styles):
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import ListFlowable, ListItem, Paragraph, Table, TableStyle
+
+    flowables, bullets, rows = [], [], []
+
+    def flush_table():
+        if rows:
+            # Paragraph cells need fixed column widths; split the text width between the columns
+            columns = max(len(row) for row in rows)
+            cells = [[Paragraph(_inline(cell), styles["body"]) for cell in row + [""] * (columns - len(row))] for row in rows]
+            table = Table(cells, colWidths=[(A4[0] - 2 * MARGIN * mm) / columns] * columns, repeatRows=1)
+            table.setStyle(TableStyle([
+                ("GRID", (0, 0), (-1, -1), 0.5, HexColor(ACCENT)),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]))
+            flowables.append(table)
+            rows.clear()
+
+    def flush_bullets():
+        if bullets:
+            flowables.append(ListFlowable(
+                [ListItem(Paragraph(item, styles["body"])) for item in bullets],
+                bulletType="bullet",
+                leftIndent=12,
+            ))
+            bullets.clear()
+
+    for line in body.splitlines():
+        if _TABLE_ROW.match(line):
+            flush_bullets()
+            if not _TABLE_RULE.match(line):
+                rows.append(_table_cells(line))
+            continue
+        flush_table()
+        if not line.strip():
+            flush_bullets()
+            continue
+        if _BULLET.match(line):
+            bullets.append(_inline(_BULLET.sub("", line)))
+        else:
+            flush_bullets()
+            flowables.append(Paragraph(_inline(line), styles["body"]))
+    flush_bullets()
+    flush_table()
+    return flowables
+
+
+def build_pdf(text):
+    """Render an analysis result to PDF bytes."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    report = parse_report(text)
+    styles = _styles()
+    story = [Paragraph("Your Career Intelligence Report", styles["title"]), Spacer(1, 4 * mm)]
+    if report.preamble:
+        story.extend(_markdown_flowables(report.preamble, styles))
+    for key, body in report.sections():
+        story.append(Paragraph(_TITLE_BY_KEY[key], styles["heading"]))
+        story.extend(_markdown_flowables(body, styles))
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        title="Career Intelligence Report",
+        leftMargin=MARGIN * mm,
+        rightMargin=MARGIN * mm,
+        topMargin=MARGIN * mm,
+        bottomMargin=MARGIN * mm,
+    )
+    doc.build(story)
+    return buffer.getvalue()
+
+
+class PdfExporter:
+    """Builds PDFs on a background thread pool, keeping recent bytes by result hash."""
+
+    def __init__(self, max_workers=2, max_entries=64):
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf")
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, text):
+        """Start rendering text unless it is already rendered or in progress."""
+        digest = parse_report(text).content_hash
+        with self._lock:
+            if digest in self._futures:
+                self._futures.move_to_end(digest)
+                return digest
+            self._futures[digest] = self._executor.submit(build_pdf, text)
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+        return digest
+
+    def get(self, text):
+        """PDF bytes for text if ready, None while rendering; re-raises render errors."""
+        digest = parse_report(text).content_hash
+        with self._lock:
+            future = self._futures.get(digest)
+        if future is None or not future.done():
+            return None
+        return future.result()
@@ -0,0 +1,83 @@
+import functools
+import hashlib
+import re
+from dataclasses import dataclass
+
+# key, marker title used by the prompts, styled header shown in the app
+SECTION_SPECS = [
+    ("roles", "Eligible Job Roles", "🎯 Perfect Job Matches for You"),
+    ("skill_gaps", "Skill Gap Analysis", "📈 Skills Development Roadmap"),
+    ("companies", "Companies Hiring", "🏢 Companies Looking for Your Talents"),
+    ("salaries", "Salary Packages", "💰 Earning Potential & Compensation"),
+]
+SECTION_KEYS = [key for key, _, _ in SECTION_SPECS]
+
+# Matches "*Eligible Job Roles:*" as prompted, plus the "**...:**" / "## ..." variants models drift into
+_MARKER = re.compile(
+    r"^[ \t]*(?:#{1,6}[ \t]*)?\*{0,2}[ \t]*("
+    + "|".join(re.escape(title) for _, title, _ in SECTION_SPECS)
+    + r")[ \t]*(?::[ \t]*\*{0,2}|\*{1,2}[ \t]*:)[ \t]*",
+    re.MULTILINE | re.IGNORECASE,
+)
+_KEY_BY_TITLE = {title.lower(): key for key, title, _ in SECTION_SPECS}
+_LABEL_BY_KEY = {key: label for key, _, label in SECTION_SPECS}
+
+
+@dataclass(frozen=True)
+class Report:
+    """Agent output split into its four sections; text before the first marker is the preamble."""
+
+    content_hash: str
+    preamble: str = ""
+    roles: str = ""
+    skill_gaps: str = ""
+    companies: str = ""
+    salaries: str = ""
+
+    def sections(self):
+        """(key, body) pairs in report order, skipping sections the model left out."""
+        return [(key, getattr(self, key)) for key in SECTION_KEYS if getattr(self, key)]
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def parse_report(text, memoize=True):
+    """Parse agent output into a Report, memoized by content hash.
+
+    Pass memoize=False for transient text such as a report still streaming in.
+    """
+    digest = content_hash(text)
+    return _parse_cached(digest, text) if memoize else _parse(digest, text)
+
+
+def _parse(digest, text):
+    parts = {key: [] for key in SECTION_KEYS}
+    matches = list(_MARKER.finditer(text))
+    preamble = text[: matches[0].start()] if matches else text
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        # A repeated marker continues the same section rather than replacing it
+        parts[_KEY_BY_TITLE[match.group(1).lower()]].append(text[match.end():end].strip())
+    return Report(
+        content_hash=digest,
+        preamble=preamble.strip(),
+        **{key: "\n\n".join(chunk for chunk in chunks if chunk) for key, chunks in parts.items()},
+    )
+
+
+_parse_cached = functools.lru_cache(maxsize=256)(_parse)
+
+
+@functools.lru_cache(maxsize=1024)
+def render_section_html(key, body):
+    """Styled header plus markdown body for one section."""
+    return f"<div class='info-label'>{_LABEL_BY_KEY[key]}</div>\n\n{body}"
+
+
+def render_report_html(report):
+    """The whole report as one markdown/HTML string, built from cached section fragments."""
+    fragments = [report.preamble] if report.preamble else []
+    fragments.extend(render_section_html(key, body) for key, body in report.sections())
+    return "\n\n".join(fragments)
@@ -0,0 +1,138 @@
+"""Vectorized skill-to-role matching over a local role taxonomy.
+
+The taxonomy (data/role_taxonomy.json) is compiled into a roles x skills
+weight matrix. A candidate becomes a 0/1 skill vector, so scoring against
+every role is one matrix-vector product, and a batch of candidates is one
+matrix multiply. The compiled matrix is saved next to the cache as .npy and
+memory-mapped on later loads.
+
+    python role_matcher.py "Python, SQL, Spark, AWS"
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from cache import DEFAULT_CACHE_DIR
+from skills import canonicalize_skills
+
+DEFAULT_TAXONOMY_PATH = os.environ.get(
+    "ROLE_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "role_taxonomy.json")
+)
+
+
+class RoleMatcher:
+    def __init__(self, titles, skill_names, weights):
+        self.titles = titles
+        self.skill_names = skill_names
+        self.vocabulary = {name.lower(): column for column, name in enumerate(skill_names)}
+        self.weights = weights
+        self.totals = np.asarray(weights.sum(axis=1), dtype=np.float32)
+
+    @classmethod
+    def load(cls, taxonomy_path=DEFAULT_TAXONOMY_PATH, cache_dir=DEFAULT_CACHE_DIR, mmap=True):
+        """Build the matcher from a taxonomy file, reusing a memory-mapped compiled matrix when present."""
+        with open(taxonomy_path, "rb") as f:
+            raw = f.read()
+        taxonomy = json.loads(raw)
+        titles = [role["title"] for role in taxonomy["roles"]]
+        skill_names, vocabulary = [], {}
+        rows = []
+        for role in taxonomy["roles"]:
+            row = {}
+            for skill, weight in role["skills"].items():
+                for name in canonicalize_skills(skill):
+                    if name.lower() not in vocabulary:
+                        vocabulary[name.lower()] = len(skill_names)
+                        skill_names.append(name)
+                    row[vocabulary[name.lower()]] = float(weight)
+            rows.append(row)
+
+        matrix_path = None
+        if cache_dir and mmap:
+            # The columns come from canonicalize_skills() as well as the taxonomy, so a splitter or
+            # alias change must not reuse a matrix compiled for another vocabulary
+            digest = hashlib.sha256(raw + json.dumps(skill_names).encode("utf-8")).hexdigest()[:16]
+            matrix_path = os.path.join(cache_dir, f"role_matrix.{digest}.npy")
+            if os.path.exists(matrix_path):
+                weights = np.load(matrix_path, mmap_mode="r")
+                if weights.shape == (len(titles), len(skill_names)):
+                    return cls(titles, skill_names, weights)
+
+        weights = np.zeros((len(titles), len(skill_names)), dtype=np.float32)
+        for index, row in enumerate(rows):
+            for column, weight in row.items():
+                weights[index, column] = weight
+        if matrix_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{matrix_path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, weights)
+            os.replace(tmp_path, matrix_path)
+            weights = np.load(matrix_path, mmap_mode="r")
+        return cls(titles, skill_names, weights)
+
+    def vectorize(self, skill_lists):
+        """0/1 matrix of candidates x vocabulary; skills outside the taxonomy are ignored."""
+        vectors = np.zeros((len(skill_lists), len(self.vocabulary)), dtype=np.float32)
+        for row, skills in enumerate(skill_lists):
+            columns = [self.vocabulary[name.lower()] for name in skills if name.lower() in self.vocabulary]
+            vectors[row, columns] = 1.0
+        return vectors
+
+    def score(self, vectors):
+        """Weighted skill coverage of every role for every candidate, in [0, 1]."""
+        return (vectors @ self.weights.T) / self.totals
+
+    def rank_batch(self, skill_lists, k=5, missing=5):
+        """Top-k roles with their most important missing skills for each candidate."""
+        vectors = self.vectorize(skill_lists)
+        scores = self.score(vectors)
+        k = min(k, len(self.titles))
+        # argpartition finds the top-k without sorting every role
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            candidates = candidates[np.argsort(-scores[row, candidates])]
+            gaps = self.weights[candidates] * (1.0 - vectors[row])
+            matches = []
+            for role, gap in zip(candidates, gaps):
+                if scores[row, role] <= 0:
+                    continue
+                order = np.argsort(-gap)[:missing]
+                matches.append({
+                    "title": self.titles[role],
+                    "score": round(float(scores[row, role]), 3),
+                    "missing": [self.skill_names[column] for column in order if gap[column] > 0],
+                })
+            results.append(matches)
+        return results
+
+    def rank(self, skills, k=5, missing=5):
+        return self.rank_batch([skills], k=k, missing=missing)[0]
+
+
+def format_matches(matches):
+    """Ranked roles and gaps as prompt lines."""
+    lines = []
+    for match in matches:
+        line = f"- {match['title']}: {match['score']:.0%} of weighted core skills"
+        if match["missing"]:
+            line += f"; missing: {', '.join(match['missing'])}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank taxonomy roles for a skill list.")
+    parser.add_argument("skills")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--taxonomy", default=DEFAULT_TAXONOMY_PATH)
+    args = parser.parse_args(argv)
+    matcher = RoleMatcher.load(args.taxonomy)
+    print(format_matches(matcher.rank(canonicalize_skills(args.skills), k=args.k)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Local columnar salary percentiles keyed by role, location and experience band.
+
+Each column is a separate .npy file that is memory-mapped on load. Rows are
+sorted by a packed (role, location, band) key, so a lookup is one binary
+search over the key column. refresh() rebuilds the store from imported CSV
+files into a new version directory and atomically switches the CURRENT
+pointer, so running app processes keep reading a consistent snapshot.
+
+    python salary_store.py refresh imports/levels-2025q2.csv imports/survey.csv
+    python salary_store.py lookup "Data Engineer" "NYC" "Mid Level (2-5 years)"
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from cache import DEFAULT_CACHE_DIR
+
+DEFAULT_STORE_DIR = os.environ.get("SALARY_STORE_DIR", os.path.join(DEFAULT_CACHE_DIR, "salaries"))
+PERCENTILES = ["p10", "p25", "p50", "p75", "p90"]
+BANDS = ["entry", "mid", "senior", "expert"]
+ANY_LOCATION = "any"
+
+LOCATION_ALIASES = {
+    "nyc": "new york",
+    "new york city": "new york",
+    "ny": "new york",
+    "sf": "san francisco",
+    "bay area": "san francisco",
+    "la": "los angeles",
+    "bengaluru": "bangalore",
+    "bombay": "mumbai",
+    "remote": "remote",
+    "anywhere": "remote",
+    "work from home": "remote",
+    "wfh": "remote",
+}
+# The web app's experience options; each starts with its band's level word
+EXPERIENCE_LEVELS = [
+    "🌱 Entry Level (0-2 years) - Recent graduate or career starter",
+    "🚀 Mid Level (2-5 years) - Developing expertise and taking on more responsibility",
+    "⭐ Senior Level (5-10 years) - Experienced professional with proven track record",
+    "🎯 Expert Level (10+ years) - Industry leader with extensive experience",
+]
+# Tried in order: the leading level word, then a year range, then whole-word titles anywhere
+# (so the "expertise" in the Mid Level description does not read as expert)
+_LEVEL_WORD = re.compile(r"^\W*(entry|mid|senior|expert)\b")
+_YEAR_RANGES = [
+    ("expert", re.compile(r"\b10\s*\+")),
+    ("senior", re.compile(r"\b5\s*-\s*10\b")),
+    ("mid", re.compile(r"\b2\s*-\s*5\b")),
+    ("entry", re.compile(r"\b0\s*-\s*2\b")),
+]
+_BAND_PATTERNS = [
+    ("expert", re.compile(r"\b(?:expert|principal|staff|lead)\b")),
+    ("senior", re.compile(r"\b(?:senior|sr)\b")),
+    ("mid", re.compile(r"\b(?:mid|intermediate)\b")),
+    ("entry", re.compile(r"\b(?:entry|junior|jr|graduate|intern)\b")),
+]
+
+
+def normalize_role(role):
+    return " ".join(re.sub(r"[^\w+#/ ]", " ", str(role).lower()).split())
+
+
+def normalize_location(location):
+    """Lowercased city name with common abbreviations expanded; 'Hybrid (London)' -> 'london'."""
+    text = str(location or "").lower()
+    inner = re.search(r"\(([^)]+)\)", text)
+    if inner:
+        text = inner.group(1)
+    text = " ".join(re.sub(r"[^\w ]", " ", text.split(",")[0]).split())
+    text = re.sub(r"^(hybrid|onsite|on site)\s+", "", text)
+    return LOCATION_ALIASES.get(text, text) or ANY_LOCATION
+
+
+def experience_band(experience_level):
+    """Map the experience selectbox text or a years figure to entry/mid/senior/expert.
+
+    >>> [experience_band(level) for level in EXPERIENCE_LEVELS]
+    ['entry', 'mid', 'senior', 'expert']
+    """
+    text = str(experience_level or "").lower()
+    leading = _LEVEL_WORD.search(text)
+    if leading:
+        return leading.group(1)
+    for band, pattern in _YEAR_RANGES + _BAND_PATTERNS:
+        if pattern.search(text):
+            return band
+    years = re.search(r"\d+(\.\d+)?", text)
+    if years:
+        value = float(years.group())
+        return "entry" if value < 2 else "mid" if value < 5 else "senior" if value < 10 else "expert"
+    return None
+
+
+def _pack(role_id, location_id, band_id):
+    return (np.int64(role_id) << 32) | (np.int64(location_id) << 8) | np.int64(band_id)
+
+
+class SalaryStore:
+    def __init__(self, directory, meta, columns):
+        self.directory = directory
+        self.meta = meta
+        self.columns = columns
+        self._role_ids = {name: index for index, name in enumerate(meta["roles"])}
+        self._location_ids = {name: index for index, name in enumerate(meta["locations"])}
+
+    @classmethod
+    def open(cls, store_dir=DEFAULT_STORE_DIR):
+        """Memory-map the current version, or return None if no data has been imported."""
+        pointer = os.path.join(store_dir, "CURRENT")
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer, encoding="utf-8") as f:
+            directory = os.path.join(store_dir, f.read().strip())
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in ["key", *PERCENTILES, "samples", "derived"]
+        }
+        return cls(directory, meta, columns)
+
+    def __len__(self):
+        return len(self.columns["key"])
+
+    def lookup(self, role, location, experience_level):
+        """Percentile range for one role/location/band, falling back to the role's any-location row."""
+        band = experience_band(experience_level)
+        role_id = self._role_ids.get(normalize_role(role))
+        if band is None or role_id is None:
+            return None
+        band_id = BANDS.index(band)
+        keys = self.columns["key"]
+        for place in (normalize_location(location), ANY_LOCATION):
+            location_id = self._location_ids.get(place)
+            if location_id is None:
+                continue
+            key = _pack(role_id, location_id, band_id)
+            row = int(np.searchsorted(keys, key))
+            if row < len(keys) and keys[row] == key:
+                return {
+                    "role": self.meta["roles"][role_id],
+                    "location": place,
+                    "band": band,
+                    "currency": self.meta["currency"],
+                    "samples": int(self.columns["samples"][row]),
+                    **{name: float(self.columns[name][row]) for name in PERCENTILES},
+                }
+        return None
+
+
+def _load_import(path):
+    # pandas is only needed to import data, so lookups in the app never load it
+    import pandas as pd
+
+    frame = pd.read_json(path, lines=True) if path.endswith((".jsonl", ".ndjson")) else pd.read_csv(path)
+    frame.columns = [column.strip().lower() for column in frame.columns]
+    experience_column = next((c for c in ("experience", "experience_level", "band", "years") if c in frame.columns), None)
+    if "role" not in frame.columns or experience_column is None:
+        raise ValueError(f"{path}: needs a role column and an experience/band/years column")
+    frame["role"] = frame["role"].map(normalize_role)
+    frame["location"] = frame["location"].map(normalize_location) if "location" in frame.columns else ANY_LOCATION
+    frame["band"] = frame[experience_column].map(experience_band)
+    frame = frame.dropna(subset=["band"])
+
+    if "salary" in frame.columns:
+        # Raw observations: aggregate into percentiles per group
+        grouped = frame.groupby(["role", "location", "band"])["salary"]
+        summary = grouped.quantile([0.1, 0.25, 0.5, 0.75, 0.9]).unstack()
+        summary.columns = PERCENTILES
+        summary["samples"] = grouped.size()
+        return summary.reset_index()
+    missing = [name for name in PERCENTILES if name not in frame.columns]
+    if missing:
+        raise ValueError(f"{path}: needs a salary column or percentile columns {', '.join(PERCENTILES)}")
+    if "samples" not in frame.columns:
+        frame["samples"] = 0
+    return frame[["role", "location", "band", *PERCENTILES, "samples"]]
+
+
+def refresh(paths, store_dir=DEFAULT_STORE_DIR, currency="USD"):
+    """Merge imported files over the current data and publish a new version; returns its row count."""
+    import pandas as pd
+
+    frames = [_load_import(path) for path in paths]
+    current = SalaryStore.open(store_dir)
+    if current is not None:
+        # Groups present in the new files replace the previous figures; fallbacks are recomputed below
+        frames.insert(0, _to_frame(current))
+    data = pd.concat(frames, ignore_index=True).drop_duplicates(["role", "location", "band"], keep="last")
+
+    # Every role also gets an any-location row so unknown cities still resolve locally
+    overall = data[data["location"] != ANY_LOCATION].groupby(["role", "band"], as_index=False).agg(
+        {**{name: "median" for name in PERCENTILES}, "samples": "sum"}
+    )
+    overall["location"] = ANY_LOCATION
+    overall["derived"] = True
+    data["derived"] = False
+    existing = set(zip(data["role"], data["location"], data["band"]))
+    overall = overall[[(r, ANY_LOCATION, b) not in existing for r, b in zip(overall["role"], overall["band"])]]
+    data = pd.concat([data, overall], ignore_index=True)
+
+    roles = sorted(data["role"].unique())
+    locations = sorted(data["location"].unique())
+    role_ids = data["role"].map({name: index for index, name in enumerate(roles)}).to_numpy(np.int64)
+    location_ids = data["location"].map({name: index for index, name in enumerate(locations)}).to_numpy(np.int64)
+    band_ids = data["band"].map({name: index for index, name in enumerate(BANDS)}).to_numpy(np.int64)
+    keys = (role_ids << 32) | (location_ids << 8) | band_ids
+    order = np.argsort(keys, kind="stable")
+
+    version = f"v{time.time_ns()}"
+    directory = os.path.join(store_dir, version)
+    os.makedirs(directory)
+    np.save(os.path.join(directory, "key.npy"), keys[order])
+    for name in PERCENTILES:
+        np.save(os.path.join(directory, f"{name}.npy"), data[name].to_numpy(np.float32)[order])
+    np.save(os.path.join(directory, "samples.npy"), data["samples"].fillna(0).to_numpy(np.int32)[order])
+    np.save(os.path.join(directory, "derived.npy"), data["derived"].to_numpy(bool)[order])
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"roles": roles, "locations": locations, "currency": currency, "created_at": time.time()}, f)
+
+    pointer_tmp = os.path.join(store_dir, f"CURRENT.{os.getpid()}.tmp")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(store_dir, "CURRENT"))
+    return len(keys)
+
+
+def _to_frame(store):
+    """Imported (non-derived) rows of a store version as a DataFrame."""
+    import pandas as pd
+
+    keep = ~np.asarray(store.columns["derived"])
+    keys = np.asarray(store.columns["key"])[keep]
+    return pd.DataFrame({
+        "role": [store.meta["roles"][index] for index in (keys >> 32)],
+        "location": [store.meta["locations"][index] for index in ((keys >> 8) & 0xFFFFFF)],
+        "band": [BANDS[index] for index in (keys & 0xFF)],
+        **{name: np.asarray(store.columns[name])[keep] for name in PERCENTILES},
+        "samples": np.asarray(store.columns["samples"])[keep],
+    })
+
+
+def format_salaries(rows):
+    """Salary ranges as prompt lines."""
+    lines = []
+    for row in rows:
+        place = "all locations" if row["location"] == ANY_LOCATION else row["location"].title()
+        lines.append(
+            f"- {row['role'].title()} ({row['band']}, {place}): "
+            f"median {row['p50']:,.0f} {row['currency']}, "
+            f"P25-P75 {row['p25']:,.0f}-{row['p75']:,.0f}, P10-P90 {row['p10']:,.0f}-{row['p90']:,.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain and query the local salary store.")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="Store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    refresh_parser = commands.add_parser("refresh", help="Import CSV/JSONL salary files and publish a new version")
+    refresh_parser.add_argument("files", nargs="+")
+    refresh_parser.add_argument("--currency", default="USD")
+    lookup_parser = commands.add_parser("lookup", help="Look up one role/location/experience")
+    lookup_parser.add_argument("role")
+    lookup_parser.add_argument("location")
+    lookup_parser.add_argument("experience")
+    args = parser.parse_args(argv)
+
+    if args.command == "refresh":
+        rows = refresh(args.files, args.store, currency=args.currency)
+        print(f"Published {rows} salary rows to {args.store}", file=sys.stderr)
+        return
+    store = SalaryStore.open(args.store)
+    if store is None:
+        raise SystemExit(f"No salary data in {args.store}; run the refresh command first")
+    started = time.perf_counter()
+    row = store.lookup(args.role, args.location, args.experience)
+    elapsed_us = (time.perf_counter() - started) * 1e6
+    print(json.dumps(row) if row else "no match")
+    print(f"lookup took {elapsed_us:.0f} µs", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
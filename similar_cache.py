@@ -0,0 +1,163 @@
+"""Near-duplicate lookup of cached analyses with MinHash signatures and LSH.
+
+A profile becomes a set of tokens: its canonical skills plus the content
+words of its career goals. MinHash compresses that set into a fixed-length
+signature whose agreement rate estimates Jaccard similarity, and LSH banding
+puts signatures that agree on a whole band into the same bucket, so a lookup
+only compares against a handful of candidates. Experience level, location and
+mode are a hard scope: profiles only match within the same scope.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from cache import DEFAULT_CACHE_DIR, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL
+from skills import canonicalize_skills
+
+# Minimum Jaccard similarity for reusing a near-identical profile's report; 0 disables the lookup
+SIMILAR_CACHE_THRESHOLD = float(os.environ.get("SIMILAR_CACHE_THRESHOLD", 0.8))
+SIMILAR_NOTICE = "ℹ️ *Similar profile:* this report was generated for a closely matching profile and reused."
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs at Jaccard 0.8 become candidates ~95% of the time, at 0.5 under 10%
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20240601)
+# Fixed coefficients so signatures are comparable across processes and restarts
+_A = _rng.integers(1, 1 << 32, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64)
+
+_STOPWORDS = frozenset(
+    "a an and as at be but by for from get i in into is it me my of on or so that the to want with "
+    "would like looking role roles job work working become".split()
+)
+
+
+def _stem(word):
+    for suffix in ("ing", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def profile_tokens(skills, career_goals):
+    """Token set compared between profiles: canonical skills and career-goal content words."""
+    tokens = {f"s:{name.lower()}" for name in canonicalize_skills(skills)}
+    for word in re.findall(r"[a-z0-9+#]+", str(career_goals or "").lower()):
+        if word not in _STOPWORDS and len(word) > 1:
+            tokens.add(f"g:{_stem(word)}")
+    return tokens
+
+
+def signature(tokens):
+    """MinHash signature (NUM_PERM uint64 values) of a token set."""
+    if not tokens:
+        return None
+    hashed = np.array(
+        [int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little") for token in tokens],
+        dtype=np.uint64,
+    )
+    # (a * x + b) mod p for every permutation and token; a, x < 2**32 so the product fits in uint64
+    return ((np.outer(_A, hashed) + _B[:, None]) % _MERSENNE).min(axis=1)
+
+
+def _buckets(sig, scope):
+    return [
+        hashlib.blake2b(scope.encode("utf-8") + sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+def is_similar(report):
+    return bool(report) and report.startswith(SIMILAR_NOTICE)
+
+
+class SimilarIndex:
+    """SQLite-backed LSH index from profile signatures to result-cache keys.
+
+    Entries age out with the result cache TTL; a key whose result has been
+    evicted simply misses in the result cache and is skipped by the caller.
+    """
+
+    def __init__(self, path, threshold=0.8, ttl=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS signatures (
+                key TEXT PRIMARY KEY,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                bucket TEXT NOT NULL,
+                key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets_bucket ON buckets (bucket);
+            CREATE INDEX IF NOT EXISTS idx_buckets_key ON buckets (key);
+            CREATE INDEX IF NOT EXISTS idx_signatures_created ON signatures (created_at);
+            """
+        )
+        self._conn.commit()
+
+    def add(self, key, tokens, scope):
+        """Index the result stored under key for a profile's token set."""
+        sig = signature(tokens)
+        if sig is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets WHERE key = ?", (key,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures (key, signature, created_at) VALUES (?, ?, ?)",
+                (key, sig.tobytes(), now),
+            )
+            self._conn.executemany(
+                "INSERT INTO buckets (bucket, key) VALUES (?, ?)", [(bucket, key) for bucket in _buckets(sig, scope)]
+            )
+            self._conn.execute(
+                "DELETE FROM signatures WHERE created_at < ? OR key IN ("
+                "SELECT key FROM signatures ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (now - self.ttl, self.max_entries),
+            )
+            self._conn.execute("DELETE FROM buckets WHERE key NOT IN (SELECT key FROM signatures)")
+            self._conn.commit()
+
+    def lookup(self, tokens, scope, limit=5):
+        """Up to limit (key, estimated Jaccard) pairs at or above the threshold, most similar first."""
+        sig = signature(tokens)
+        if sig is None:
+            return []
+        buckets = _buckets(sig, scope)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT signatures.key, signatures.signature FROM signatures WHERE created_at >= ? AND key IN ("
+                f"SELECT key FROM buckets WHERE bucket IN ({', '.join('?' * len(buckets))}))",
+                (time.time() - self.ttl, *buckets),
+            ).fetchall()
+        matches = []
+        for key, blob in rows:
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint64) == sig))
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+
+def open_similar_index(cache_dir=DEFAULT_CACHE_DIR, threshold=SIMILAR_CACHE_THRESHOLD):
+    """Open the near-duplicate index that sits beside the result cache, or None when disabled."""
+    if threshold <= 0:
+        return None
+    return SimilarIndex(os.path.join(cache_dir, "similar.sqlite3"), threshold=threshold)
@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait on the same future and receive the same result (or
+    exception). Nothing is remembered once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, state=None, join=None):
+        """Run fn() for key unless an identical call is already running.
+
+        The leader's state is handed to join(state) for each caller that
+        would wait on it; if join returns False, that caller runs fn() on
+        its own instead.
+        """
+        with self._lock:
+            entry = self._calls.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._calls[key] = (Future(), state)
+        future = entry[0]
+        if not leader:
+            if join is None or join(entry[1]) is not False:
+                return future.result()
+            return fn()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        """Number of distinct keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,139 @@
+import re
+
+# Common abbreviations and spelling variants mapped to one canonical skill name
+SKILL_ALIASES = {
+    "ml": "Machine Learning",
+    "machine learning": "Machine Learning",
+    "dl": "Deep Learning",
+    "deep learning": "Deep Learning",
+    "ai": "Artificial Intelligence",
+    "artificial intelligence": "Artificial Intelligence",
+    "nlp": "Natural Language Processing",
+    "natural language processing": "Natural Language Processing",
+    "cv": "Computer Vision",
+    "computer vision": "Computer Vision",
+    "js": "JavaScript",
+    "javascript": "JavaScript",
+    "ts": "TypeScript",
+    "typescript": "TypeScript",
+    "py": "Python",
+    "python": "Python",
+    "python3": "Python",
+    "sql": "SQL",
+    "nosql": "NoSQL",
+    "postgres": "PostgreSQL",
+    "postgresql": "PostgreSQL",
+    "mysql": "MySQL",
+    "mongo": "MongoDB",
+    "mongodb": "MongoDB",
+    "react": "React",
+    "reactjs": "React",
+    "react.js": "React",
+    "node": "Node.js",
+    "nodejs": "Node.js",
+    "node.js": "Node.js",
+    "vue": "Vue.js",
+    "vuejs": "Vue.js",
+    "vue.js": "Vue.js",
+    "angular": "Angular",
+    "angularjs": "Angular",
+    ".net": ".NET",
+    "html": "HTML",
+    "html5": "HTML",
+    "css": "CSS",
+    "css3": "CSS",
+    "java": "Java",
+    "c++": "C++",
+    "cpp": "C++",
+    "c#": "C#",
+    "csharp": "C#",
+    "golang": "Go",
+    "go": "Go",
+    "k8s": "Kubernetes",
+    "kubernetes": "Kubernetes",
+    "docker": "Docker",
+    "aws": "AWS",
+    "amazon web services": "AWS",
+    "gcp": "Google Cloud",
+    "google cloud": "Google Cloud",
+    "google cloud platform": "Google Cloud",
+    "azure": "Azure",
+    "microsoft azure": "Azure",
+    "ci/cd": "CI/CD",
+    "cicd": "CI/CD",
+    "devops": "DevOps",
+    "excel": "Excel",
+    "ms excel": "Excel",
+    "microsoft excel": "Excel",
+    "powerbi": "Power BI",
+    "power bi": "Power BI",
+    "tableau": "Tableau",
+    "pm": "Project Management",
+    "project management": "Project Management",
+    "ux": "UX Design",
+    "ux design": "UX Design",
+    "ui": "UI Design",
+    "ui design": "UI Design",
+    "data analysis": "Data Analysis",
+    "data analytics": "Data Analysis",
+    "communication": "Communication",
+    "communication skills": "Communication",
+    "leadership": "Leadership",
+    "problem solving": "Problem Solving",
+    "problem-solving": "Problem Solving",
+    "teamwork": "Teamwork",
+    "spark": "Apache Spark",
+    "apache spark": "Apache Spark",
+    "pyspark": "Apache Spark",
+    "airflow": "Airflow",
+    "apache airflow": "Airflow",
+    "llm": "LLMs",
+    "llms": "LLMs",
+    "large language models": "LLMs",
+    "rest": "REST APIs",
+    "rest api": "REST APIs",
+    "rest apis": "REST APIs",
+    "terraform": "Terraform",
+    "linux": "Linux",
+    "git": "Git",
+    "figma": "Figma",
+    "seo": "SEO",
+    "agile": "Agile",
+    "scrum": "Scrum",
+    "statistics": "Statistics",
+    "stats": "Statistics",
+}
+
+# A slash only separates skills when spaced ("Python / SQL"); "TCP/IP" and "A/B testing" are one skill each,
+# and "and" never does, so "Research and Development" stays whole
+_SEPARATORS = re.compile(r"[,;\n\r\t|•]+|\s+/\s+")
+# Skill names containing a separator that must not be split
+_PROTECTED = re.compile(r"ci\s*/\s*cd", re.IGNORECASE)
+
+
+def _split(text):
+    protected = _PROTECTED.findall(text)
+    text = _PROTECTED.sub("\x00", text)
+    for part in _SEPARATORS.split(text):
+        while "\x00" in part:
+            part = part.replace("\x00", protected.pop(0), 1)
+        yield part
+
+
+def canonicalize_skills(text):
+    """Turn free-text skills into a sorted, de-duplicated list of canonical names."""
+    canonical = {}
+    for raw in _split(text or ""):
+        # A leading dot is part of names like ".NET"; only trailing ones are punctuation
+        token = " ".join(raw.strip(" -*()[]\"'").rstrip(".").split())
+        token = re.sub(r"\s*/\s*", "/", token)
+        if not token:
+            continue
+        name = SKILL_ALIASES.get(token.lower(), token)
+        canonical.setdefault(name.lower(), name)
+    return sorted(canonical.values(), key=str.lower)
+
+
+def skills_signature(text):
+    """Compact comma-separated form of the canonical skill set."""
+    return ", ".join(canonicalize_skills(text))
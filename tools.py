@@ -0,0 +1,76 @@
+from phi.tools.tavily import TavilyTools
+
+from budget import TOOL_REFUSAL, current_budget
+from cache import fingerprint
+from metrics import count_tool_call, timed
+
+
+class CachedTavilyTools(TavilyTools):
+    """TavilyTools that serves repeated searches from a shared DiskCache.
+
+    The cache key covers the normalized query and every parameter that
+    changes the search output, so different depths or result counts never
+    share an entry.
+    """
+
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def _cache_key(self, method, query, max_results):
+        return fingerprint(
+            method,
+            query,
+            max_results,
+            getattr(self, "search_depth", None),
+            getattr(self, "include_answer", None),
+            getattr(self, "format", None),
+            getattr(self, "max_tokens", None),
+        )
+
+    def _cached_call(self, tool, key, call):
+        cached = self.cache.get(key)
+        count_tool_call(tool, cached is not None)
+        if cached is not None:
+            return cached
+        budget = current_budget()
+        if budget is not None and not budget.allow_tool_call():
+            return TOOL_REFUSAL
+        with timed("tool", tool=tool):
+            result = call()
+        if result:
+            self.cache.set(key, result)
+        return result
+
+    def web_search_using_tavily(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search the web for a given query.
+        This function uses the Tavily API to search the web.
+
+        Args:
+            query (str): The query to search for.
+            max_results (int): Maximum number of results to return. Defaults to 5.
+
+        Returns:
+            str: The search results.
+        """
+        return self._cached_call(
+            "web_search_using_tavily",
+            self._cache_key("search", query, max_results),
+            lambda: super(CachedTavilyTools, self).web_search_using_tavily(query, max_results=max_results),
+        )
+
+    def web_search_with_tavily(self, query: str) -> str:
+        """Use this function to search the web for a given query.
+        This function uses the Tavily API to search the web.
+
+        Args:
+            query (str): The query to search for.
+
+        Returns:
+            str: The search results.
+        """
+        return self._cached_call(
+            "web_search_with_tavily",
+            self._cache_key("context", query, None),
+            lambda: super(CachedTavilyTools, self).web_search_with_tavily(query),
+        )
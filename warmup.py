@@ -0,0 +1,177 @@
+"""Off-peak cache warm-up for the most requested profiles.
+
+Mines the "request" events the web app writes to the metrics event log,
+picks the top-N profiles by request count and re-runs their analyses while
+the clock is inside the off-peak window, so that peak-hour users get cached
+reports. A profile is only re-run when its cached report is missing or will
+expire within --margin seconds, and each pass stops after --max-runs agent
+runs to stay within the API quota.
+
+    python warmup.py --top 200 --window 1-6 --max-runs 150
+    python warmup.py --loop            # stay running and warm up every night
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from advisor import analyze_profile, create_agent, open_local_data, prepare_profile
+from agent_pool import AgentPool
+from batch import load_api_keys
+from budget import is_partial
+from cache import RESULT_CACHE_TTL, open_result_cache, open_search_cache
+from metrics import EVENT_LOG_BACKUPS, EVENT_LOG_PATH, log_event
+
+
+def read_requests(path=EVENT_LOG_PATH, since=0.0, backups=EVENT_LOG_BACKUPS):
+    """Yield request events newer than since from the event log and its rotated files."""
+    for candidate in [path] + [f"{path}.{index}" for index in range(1, backups + 1)]:
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if event.get("event") == "request" and event.get("ts", 0) >= since:
+                    yield event
+
+
+def _normalized(value):
+    return " ".join(str(value or "").lower().split())
+
+
+def top_profiles(events, n=200):
+    """The n most requested (skills, experience, location, mode) combinations.
+
+    Career goals are free text that rarely repeats exactly, so each
+    combination is warmed with its most frequent wording.
+    """
+    counts = Counter()
+    variants = {}
+    for event in events:
+        group = tuple(_normalized(event.get(field)) for field in ("skills", "experience_level", "preferred_location", "mode"))
+        if not group[0]:
+            continue
+        counts[group] += 1
+        wording = (event.get("career_goals") or "", event["skills"], event["experience_level"], event["preferred_location"])
+        variants.setdefault(group, Counter())[wording] += 1
+    profiles = []
+    for group, count in counts.most_common(n):
+        career_goals, skills, experience_level, preferred_location = variants[group].most_common(1)[0][0]
+        profiles.append({
+            "skills": skills,
+            "experience_level": experience_level,
+            "preferred_location": preferred_location,
+            "career_goals": career_goals,
+            "mode": group[3] or "single",
+            "requests": count,
+        })
+    return profiles
+
+
+def in_window(window, now=None):
+    """True when the local hour is inside an "start-end" window such as "1-6" or "22-5"."""
+    start, end = (int(part) for part in window.split("-"))
+    hour = time.localtime(now).tm_hour
+    return start <= hour < end if start <= end else hour >= start or hour < end
+
+
+def warm_up(args):
+    """One warm-up pass; returns the number of analyses that were re-run."""
+    profiles = top_profiles(read_requests(args.log, since=time.time() - args.days * 86400), n=args.top)
+    result_cache = open_result_cache()
+    local_data = open_local_data()
+    similar_index = local_data.pop("similar_index")
+    grounding = local_data
+
+    # Resolve the same cache keys the app would use and keep only entries that are missing or about to expire
+    stale = []
+    for profile in profiles:
+        fields = [profile[field] for field in ("skills", "experience_level", "preferred_location", "career_goals")]
+        _, _, cache_key = prepare_profile(*fields, profile["mode"], **grounding)
+        remaining = result_cache.ttl_remaining(cache_key)
+        if remaining is None or remaining < args.margin:
+            stale.append((profile, fields))
+    print(f"{len(profiles)} popular profiles, {len(stale)} missing or expiring within {args.margin}s", file=sys.stderr)
+    stale = stale[: args.max_runs]
+    if not stale:
+        return 0
+
+    google_api_key, tavily_api_key = load_api_keys()
+    search_cache = open_search_cache()
+    pool = AgentPool(lambda: create_agent(google_api_key, tavily_api_key, search_cache), size=args.workers)
+
+    def refresh(item):
+        profile, fields = item
+        if not args.ignore_window and not in_window(args.window):
+            return "skipped"
+        started = time.perf_counter()
+        try:
+            result = analyze_profile(
+                pool,
+                result_cache,
+                *fields,
+                mode=profile["mode"],
+                deadline=args.deadline,
+                max_tool_calls=args.max_searches,
+                similar_index=similar_index,
+                refresh=True,
+                **grounding,
+            )
+            status = "partial" if is_partial(result) else "ok" if result else "empty"
+        except Exception as e:
+            status = "error"
+            print(f"[error] {profile['skills']!r}: {e}", file=sys.stderr)
+        elapsed = round(time.perf_counter() - started, 3)
+        log_event("warmup", status=status, seconds=elapsed, requests=profile["requests"], mode=profile["mode"])
+        print(f"[{status}] {profile['skills']!r} ({profile['requests']} requests) in {elapsed}s", file=sys.stderr)
+        return status
+
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="warmup") as executor:
+        statuses = list(executor.map(refresh, stale))
+    return sum(status != "skipped" for status in statuses)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run the most popular analyses off-peak so the cache stays warm.")
+    parser.add_argument("--log", default=EVENT_LOG_PATH, help="Metrics event log with request events")
+    parser.add_argument("--days", type=float, default=7, help="How far back to count requests (default: 7)")
+    parser.add_argument("--top", type=int, default=200, help="Number of popular profiles to keep warm (default: 200)")
+    parser.add_argument("--window", default="1-6", help="Off-peak local hours, start-end (default: 1-6)")
+    parser.add_argument("--ignore-window", action="store_true", help="Run now regardless of the off-peak window")
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=RESULT_CACHE_TTL,
+        help="Refresh entries expiring within this many seconds (default: the result TTL, i.e. before the next night)",
+    )
+    parser.add_argument("--max-runs", type=int, default=100, help="Analyses allowed per pass (default: 100)")
+    parser.add_argument("--max-searches", type=int, default=8, help="Live web searches allowed per analysis (default: 8)")
+    parser.add_argument("--deadline", type=float, default=180, help="Seconds per analysis (default: 180)")
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent analyses (default: 2)")
+    parser.add_argument("--loop", action="store_true", help="Keep running, doing one pass per off-peak window")
+    parser.add_argument("--interval", type=float, default=900, help="Seconds between window checks with --loop")
+    args = parser.parse_args(argv)
+
+    if not args.loop:
+        if not args.ignore_window and not in_window(args.window):
+            raise SystemExit(f"Outside the off-peak window {args.window}; use --ignore-window to run anyway")
+        warm_up(args)
+        return
+    ran_this_window = False
+    while True:
+        # One pass each time the off-peak window opens
+        if not in_window(args.window):
+            ran_this_window = False
+        elif not ran_this_window:
+            ran_this_window = True
+            print(f"Warm-up pass re-ran {warm_up(args)} analyses", file=sys.stderr)
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Analysis worker processes for the durable job queue.
+
+Start as many as the hardware and API quota allow, on this host or on others
+that share the cache directory; the web app only needs ANALYSIS_BACKEND=queue
+to hand its analyses to them.
+
+    python worker.py --processes 4 --threads 4
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+
+from advisor import analyze_profile, create_agent, open_local_data, preload_agent_stack
+from agent_pool import AgentPool
+from batch import load_api_keys
+from budget import Budget
+from cache import open_result_cache, open_search_cache
+from job_queue import DEFAULT_QUEUE_PATH, JobQueue
+from metrics import log_event
+from singleflight import SingleFlight
+
+
+class Worker:
+    """One process: threads claim jobs from the queue and share its agent pool and caches."""
+
+    def __init__(self, queue_path, threads=4, poll_interval=0.5, heartbeat_interval=1.0, abandon_after=60):
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.queue = JobQueue(queue_path)
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.abandon_after = abandon_after
+        google_api_key, tavily_api_key = load_api_keys()
+        search_cache = open_search_cache()
+        self.pool = AgentPool(lambda: create_agent(google_api_key, tavily_api_key, search_cache), size=threads * 4)
+        self.result_cache = open_result_cache()
+        self.single_flight = SingleFlight()
+        self.local_data = open_local_data()
+        # job id -> [budget, latest report text] for the heartbeat thread
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def run(self):
+        preload_agent_stack()
+        threading.Thread(target=self._heartbeat_forever, name="heartbeat", daemon=True).start()
+        threads = [threading.Thread(target=self._work_forever, name=f"worker-{index}") for index in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        print(f"Worker {self.name} polling {self.queue.path} with {self.threads} threads", file=sys.stderr)
+        for thread in threads:
+            thread.join()
+
+    def _work_forever(self):
+        while True:
+            try:
+                claimed = self.queue.claim(self.name, abandon_after=self.abandon_after)
+                if claimed is None:
+                    time.sleep(self.poll_interval)
+                    continue
+                self.process(*claimed)
+            except Exception as e:
+                # A locked or unreachable queue must not kill the thread; a job it was running is
+                # retried by another worker once its lease runs out
+                print(f"[error] {threading.current_thread().name}: {e}", file=sys.stderr)
+                time.sleep(self.poll_interval)
+
+    def process(self, job_id, payload):
+        budget = Budget(payload.get("deadline"), payload.get("max_tool_calls"))
+        state = [budget, ""]
+        with self._lock:
+            self._active[job_id] = state
+
+        def show_progress(text):
+            state[1] = text
+
+        started = time.perf_counter()
+        try:
+            result = analyze_profile(
+                self.pool,
+                self.result_cache,
+                payload["skills"],
+                payload["experience_level"],
+                payload["preferred_location"],
+                payload["career_goals"],
+                mode=payload.get("mode", "single"),
+                stream=payload.get("stream", True),
+                on_progress=show_progress,
+                single_flight=self.single_flight,
+                budget=budget,
+                previous=payload.get("previous"),
+                **self.local_data,
+            )
+            status = "cancelled" if budget.cancelled else "done"
+            self.queue.finish(job_id, self.name, status, result=result)
+        except Exception as e:
+            status = "failed"
+            self.queue.finish(job_id, self.name, status, error=str(e))
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+        elapsed = round(time.perf_counter() - started, 3)
+        log_event("job", status=status, seconds=elapsed, worker=self.name)
+        print(f"[{status}] {job_id} in {elapsed}s", file=sys.stderr)
+
+    def _heartbeat_forever(self):
+        # One thread renews every lease, publishes progress and relays cancels
+        while True:
+            time.sleep(self.heartbeat_interval)
+            with self._lock:
+                active = list(self._active.items())
+            for job_id, (budget, text) in active:
+                try:
+                    stop = self.queue.heartbeat(job_id, self.name, text, budget.tool_calls, abandon_after=self.abandon_after)
+                except Exception as e:
+                    # Keep renewing the other leases; this one is retried on the next beat
+                    print(f"[error] heartbeat {job_id}: {e}", file=sys.stderr)
+                    continue
+                if stop:
+                    budget.cancel()
+
+
+def _serve(args):
+    Worker(
+        args.queue,
+        threads=args.threads,
+        poll_interval=args.poll_interval,
+        abandon_after=args.abandon_after or None,
+    ).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run analysis workers for the durable job queue.")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Queue database shared with the web app")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent jobs per process (default: 4)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between polls of an empty queue")
+    parser.add_argument(
+        "--abandon-after",
+        type=float,
+        default=60,
+        help="Cancel jobs the UI has not polled for this many seconds (default: 60, 0 to never cancel)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.processes == 1:
+        _serve(args)
+        return
+    # Separate processes sidestep the GIL for parsing and rendering; each has its own agent pool
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_serve, args=(args,), name=f"worker-{index}") for index in range(args.processes)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Jobs in flight are retried by other workers once their lease runs out
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()